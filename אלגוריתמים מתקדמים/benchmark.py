@@ -0,0 +1,247 @@
+"""מדידת ביצועי ה-AI - משחקי AI נגד AI וסדרת עמדות קבועה, עם פלט JSON
+
+שני חלקים לכל גודל לוח:
+- עמדות: חיפוש לעומק קבוע על עמדות שנבנות מזרע קבוע. מספר הצמתים דטרמיניסטי,
+  כך ששינוי ב-minimax, בפונקציית ההערכה או ביצירת המהלכים נראה מיד במספרים.
+- משחקים: שני מנועים משחקים זה נגד זה לפי חוקי המשחק (חסימות, פצצה ותור כפול)
+  עם תקציב זמן למהלך. הפתיחה נבחרת מהזרע, אבל עומק ההעמקה תלוי בשעון.
+
+    python benchmark.py --sizes 5 8 10 15 --games 2 --output bench.json
+"""
+import argparse
+import json
+import math
+import random
+import time
+
+from engine import (GameState, GomokuEngine, PLAYER_SYMBOLS, BLOCK_SYMBOL, MAX_BLOCKS,
+                    AI_THINK_MS)
+
+BENCH_SIZES = (5, 8, 10, 15)
+BENCH_SEED = 1234
+BENCH_GAMES = 2  # משחקים לכל גודל לוח
+BENCH_POSITIONS = 4  # עמדות לכל גודל לוח
+BENCH_DEPTH = 3  # עומק החיפוש הקבוע בסדרת העמדות
+
+
+def swap_colors(state):
+    """העתק של המצב עם החלפת צבעים - המנוע תמיד משחק את הלבן"""
+    view = GameState(state.board_size)
+    for r, row in enumerate(state.board):
+        for c, cell in enumerate(row):
+            if cell == BLOCK_SYMBOL:
+                view.place(r, c, cell)
+            elif cell is not None:
+                view.place(r, c, PLAYER_SYMBOLS[1 - PLAYER_SYMBOLS.index(cell)])
+    return view
+
+
+def random_position(size, rng, stones):
+    """עמדה אקראית סביב המרכז - חתיכות לסירוגין וחסימה אחת, בלי רצף מנצח"""
+    state = GameState(size)
+    c = size // 2
+    radius = max(1, min(3, size // 3))
+    placed = 0
+    while placed < stones:
+        row = rng.randint(c - radius, min(size - 1, c + radius))
+        col = rng.randint(c - radius, min(size - 1, c + radius))
+        if state.board[row][col] is not None:
+            continue
+        symbol = PLAYER_SYMBOLS[placed % 2]
+        state.place(row, col, symbol)
+        if state.get_win_cells(row, col, symbol):
+            state.clear_cells([(row, col)])
+            continue
+        placed += 1
+    while True:
+        row, col = rng.randrange(size), rng.randrange(size)
+        if state.board[row][col] is None:
+            state.place(row, col, BLOCK_SYMBOL)
+            return state
+
+
+def percentile(values, pct):
+    """אחוזון לפי דירוג הקרוב ביותר - 0 לרשימה ריקה"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def solver_nodes(engine):
+    """הצמתים שהפותר המדויק של המנוע צבר עד עכשיו - 0 כשעוד לא נוצר"""
+    return engine.solver.nodes if engine.solver is not None else 0
+
+
+class SearchMeter:
+    """צבירת מדדי חיפוש - צמתים, זמן חשיבה למהלך ופגיעות בטבלת הטרנספוזיציה
+
+    צמתי הפותר המדויק (על לוחות קטנים) נספרים ב-nodes יחד עם צמתי החיפוש,
+    ומדווחים גם בנפרד ב-solver_nodes.
+    """
+
+    def __init__(self):
+        """מונים ריקים"""
+        self.times = []
+        self.nodes = 0
+        self.solver_nodes = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+
+    def measure(self, engine, search, *args):
+        """הרצת search(*args) ורישום הזמן והצמתים שהמנוע צבר בזמן הריצה"""
+        nodes, probes, hits = engine.nodes, engine.tt.probes, engine.tt.hits
+        exact = solver_nodes(engine)
+        start = time.perf_counter()
+        result = search(*args)
+        self.times.append(time.perf_counter() - start)
+        exact = solver_nodes(engine) - exact
+        self.nodes += engine.nodes - nodes + exact
+        self.solver_nodes += exact
+        self.tt_probes += engine.tt.probes - probes
+        self.tt_hits += engine.tt.hits - hits
+        return result
+
+    def report(self):
+        """סיכום המדדים כמילון שניתן לכתוב כ-JSON"""
+        total = sum(self.times)
+        moves = len(self.times)
+        return {
+            'moves': moves,
+            'nodes': self.nodes,
+            'seconds': round(total, 4),
+            'nodes_per_sec': round(self.nodes / total) if total else 0,
+            'avg_think_ms': round(total / moves * 1000, 2) if moves else 0.0,
+            'p95_think_ms': round(percentile(self.times, 95) * 1000, 2),
+            'nodes_per_move': round(self.nodes / moves, 1) if moves else 0.0,
+            'tt_hit_rate': round(self.tt_hits / self.tt_probes, 4) if self.tt_probes else 0.0,
+            'solver_nodes': self.solver_nodes,
+        }
+
+
+def play_game(size, seed, think_ms, meter):
+    """משחק AI נגד AI לפי חוקי הממשק - מחזיר (מנצח או None, מוני פעולות)
+
+    כל צד מחליט כמו ai_move: חסימה של רצף מסוכן, אחר כך פצצה, ואחר כך חיפוש.
+    השחור רואה את הלוח בצבעים מוחלפים כי המנוע תמיד מחפש עבור הלבן.
+    """
+    rng = random.Random(seed)
+    state = GameState(size)
+    engines = [GomokuEngine(), GomokuEngine()]
+    blocks_left = [MAX_BLOCKS, MAX_BLOCKS]
+    bomb_used = [False, False]
+    double_move_used = [False, False]
+    actions = {'moves': 0, 'blocks': 0, 'bombs': 0, 'double_moves': 0}
+    # פתיחה מהזרע - חתיכה שחורה ליד המרכז כדי שהמשחקים יהיו שונים זה מזה
+    c = size // 2
+    state.place(c + rng.randint(-1, 1), c + rng.randint(-1, 1), PLAYER_SYMBOLS[0])
+    player = 1
+    while not state.is_full():
+        engine = engines[player]
+        symbol = PLAYER_SYMBOLS[player]
+        view = state if player == 1 else swap_colors(state)
+        if blocks_left[player] > 0:
+            cell = engine.find_dangerous_cell(view)
+            if cell:
+                state.place(cell[0], cell[1], BLOCK_SYMBOL)
+                blocks_left[player] -= 1
+                actions['blocks'] += 1
+                player = 1 - player
+                continue
+        if not bomb_used[player]:
+            target = engine.find_bomb_target(view)
+            if target:
+                state.clear_cells(state.get_bombed_cells(*target))
+                bomb_used[player] = True
+                actions['bombs'] += 1
+                player = 1 - player
+                continue
+        turns = 1
+        while turns:
+            turns -= 1
+            best = meter.measure(engine, engine.find_best_move, view, think_ms)
+            if best is None:
+                break
+            row, col = best
+            if not double_move_used[player] and state.get_win_cells(row, col, symbol):
+                double_move_used[player] = True
+                actions['double_moves'] += 1
+                turns += 1
+            state.place(row, col, symbol)
+            actions['moves'] += 1
+            if state.get_win_cells(row, col, symbol):
+                return player, actions
+            view = state if player == 1 else swap_colors(state)
+        player = 1 - player
+    return None, actions
+
+
+def bench_positions(size, seed, count, depth):
+    """סדרת העמדות לגודל נתון - חיפוש לעומק קבוע במנוע חדש לכל עמדה"""
+    meter = SearchMeter()
+    rng = random.Random(seed * 1000 + size)
+    moves = []
+    for i in range(count):
+        state = random_position(size, rng, min(4 + 2 * i, size * size // 3))
+        engine = GomokuEngine()
+        moves.append(meter.measure(engine, engine.search_fixed_depth, state, depth))
+    result = meter.report()
+    result['depth'] = depth
+    result['best_moves'] = moves
+    return result
+
+
+def bench_games(size, seed, games, think_ms):
+    """משחקי AI נגד AI לגודל נתון - מדדי חיפוש, תוצאות ואחוזי ניצחון"""
+    meter = SearchMeter()
+    results = {'black': 0, 'white': 0, 'draw': 0}
+    totals = {'moves': 0, 'blocks': 0, 'bombs': 0, 'double_moves': 0}
+    for game in range(games):
+        winner, actions = play_game(size, seed + game, think_ms, meter)
+        results['draw' if winner is None else ('black', 'white')[winner]] += 1
+        for key, value in actions.items():
+            totals[key] += value
+    result = meter.report()
+    result['think_budget_ms'] = think_ms
+    result['results'] = results
+    result['win_rate'] = {side: round(results[side] / games, 3) if games else 0.0
+                          for side in ('black', 'white')}
+    result['actions'] = totals
+    return result
+
+
+def run_benchmark(sizes=BENCH_SIZES, seed=BENCH_SEED, games=BENCH_GAMES, positions=BENCH_POSITIONS,
+                  depth=BENCH_DEPTH, think_ms=AI_THINK_MS):
+    """הרצת כל המדידות - מחזיר מילון שמוכן לכתיבה כ-JSON"""
+    report = {'seed': seed, 'sizes': {}}
+    for size in sizes:
+        random.seed(seed)
+        report['sizes'][f'{size}x{size}'] = {
+            'positions': bench_positions(size, seed, positions, depth),
+            'games': bench_games(size, seed, games, think_ms),
+        }
+    return report
+
+
+def main():
+    """הרצת מדידת הביצועים מהשורה - JSON לפלט הרגיל או לקובץ"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(BENCH_SIZES))
+    parser.add_argument('--seed', type=int, default=BENCH_SEED)
+    parser.add_argument('--games', type=int, default=BENCH_GAMES)
+    parser.add_argument('--positions', type=int, default=BENCH_POSITIONS)
+    parser.add_argument('--depth', type=int, default=BENCH_DEPTH)
+    parser.add_argument('--think-ms', type=int, default=AI_THINK_MS)
+    parser.add_argument('--output', help='נתיב לקובץ JSON - ברירת המחדל היא הפלט הרגיל')
+    args = parser.parse_args()
+    report = run_benchmark(args.sizes, args.seed, args.games, args.positions, args.depth, args.think_ms)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1054 @@
+"""מנוע המשחק - מצב הלוח, חוקי המשחק וחיפוש ה-AI ללא תלות בממשק הגרפי"""
+import random
+import time
+
+from symmetry import canonical_hash, map_cell, unique_moves, INVERSE
+
+PLAYER_SYMBOLS = ['⚫', '⚪']
+WIN_LENGTH = 5
+AI_THINK_MS = 300  # תקציב הזמן של ה-AI לכל מהלך, במילישניות
+AI_MAX_DEPTH = 12
+AI_WORKERS = 1  # מספר התהליכים לחיפוש מקבילי בשורש - 1 הוא חיפוש סדרתי
+WIN_SCORE = 1_000_000
+CANDIDATE_RADIUS = 2  # מהלכים נבדקים רק במרחק זה מחתיכה קיימת
+BLOCK_SYMBOL = '🚫'
+MAX_BLOCKS = 3
+TT_SIZE = 1 << 20  # מספר הרשומות בטבלת הטרנספוזיציה
+VCF_MAX_NODES = 20000  # תקרת הצמתים של פותר ה-VCF לכל חיפוש
+VCF_MAX_DEPTH = 12  # מספר הארבעות הרצופות המרבי ברצף כפוי
+SOLVER_TIME_SHARE = 0.5  # החלק מתקציב המהלך שהפותר המדויק מקבל - השאר נשמר לחיפוש הרגיל
+ZOBRIST_SEED = 20250101
+SYMMETRY_MAX_STONES = 6  # עד מספר תאים תפוסים זה מפתח הטבלה קנוני - בפתיחה סימטריות נפוצות
+VECTOR_MIN_MOVES = 100  # ממספר מועמדים זה ההערכה בשורש וקטורית (כשיש NumPy) - מתחתיו הנחה והסרה זולות יותר
+
+DIRECTIONS = [(0,1),(1,0),(1,1),(1,-1)]
+
+
+class GameState:
+    """מצב הלוח - רשת התאים וחוקי המשחק הבסיסיים"""
+
+    def __init__(self, board_size):
+        """יצירת לוח ריק בגודל נתון"""
+        self.board_size = board_size
+        self.board = [[None for _ in range(board_size)] for _ in range(board_size)]
+        # לוח הביטים מסונכרן עם הרשת כדי שה-hash שלו יתעדכן בכל הנחה, חסימה ופצצה
+        self.bitboard = BitBoard(board_size)
+
+    def place(self, row, col, symbol):
+        """הצבת סימן (חתיכה או חסימה) בתא נתון"""
+        self.board[row][col] = symbol
+        idx = self.bitboard.index(row, col)
+        if symbol == BLOCK_SYMBOL:
+            self.bitboard.place_block(idx)
+        else:
+            self.bitboard.place(idx, PLAYER_SYMBOLS.index(symbol))
+
+    def with_move(self, row, col, symbol):
+        """העתק של המצב עם סימן נוסף בתא נתון - המצב עצמו לא משתנה"""
+        child = GameState(self.board_size)
+        for r, line in enumerate(self.board):
+            for c, cell in enumerate(line):
+                if cell is not None:
+                    child.place(r, c, cell)
+        child.place(row, col, symbol)
+        return child
+
+    def clear_cells(self, cells):
+        """ניקוי רשימת תאים מהלוח - משמש את הפצצה"""
+        for r, c in cells:
+            self.board[r][c] = None
+            self.bitboard.clear_cell(self.bitboard.index(r, c))
+
+    def is_full(self):
+        """בדיקה אם הלוח הנוכחי מלא"""
+        for row in self.board:
+            for cell in row:
+                if cell is None:
+                    return False
+        return True
+
+    def get_win_cells(self, row, col, symbol):
+        """בדיקה אם יש רצף מנצח מהתא הנוכחי - מחזיר את התאים המנצחים"""
+        for d_row, d_col in DIRECTIONS:
+            cells = [(row, col)]
+            r, c = row + d_row, col + d_col
+            while 0 <= r < self.board_size and 0 <= c < self.board_size and self.board[r][c] == symbol:
+                cells.append((r, c))
+                r += d_row
+                c += d_col
+            r, c = row - d_row, col - d_col
+            while 0 <= r < self.board_size and 0 <= c < self.board_size and self.board[r][c] == symbol:
+                cells.insert(0, (r, c))
+                r -= d_row
+                c -= d_col
+            if len(cells) >= WIN_LENGTH:
+                return cells[:WIN_LENGTH]
+        return None
+
+    def get_bombed_cells(self, row, col, bomb_type):
+        """קבלת רשימת התאים שיינקו על ידי הפצצה לפי סוגה"""
+        if bomb_type == 'col':
+            return [(r, col) for r in range(self.board_size)]
+        elif bomb_type == 'row':
+            return [(row, c) for c in range(self.board_size)]
+        elif bomb_type == 'diag1':  # ↘ main diagonal through (row, col)
+            cells = []
+            # Go to the top-left of the diagonal
+            r, c = row, col
+            while r > 0 and c > 0:
+                r -= 1
+                c -= 1
+            # Collect all cells along the diagonal
+            while r < self.board_size and c < self.board_size:
+                cells.append((r, c))
+                r += 1
+                c += 1
+            return cells
+        elif bomb_type == 'diag2':  # ↙ anti-diagonal through (row, col)
+            cells = []
+            # Go to the top-right of the diagonal
+            r, c = row, col
+            while r > 0 and c < self.board_size - 1:
+                r -= 1
+                c += 1
+            # Collect all cells along the diagonal
+            while r < self.board_size and c >= 0:
+                cells.append((r, c))
+                r += 1
+                c -= 1
+            return cells
+        else:
+            return [(r, col) for r in range(self.board_size)]
+
+
+# קודי התאים בתוך קוד של קו (ספרה בבסיס 4 לכל תא)
+EMPTY_CODE, BLACK_CODE, WHITE_CODE, BLOCK_CODE = 0, 1, 2, 3
+
+# ציון צורה לפי מספר החתיכות שלה - פתוחה (קצוות ריקים משני הצדדים) או סגורה
+OPEN_SHAPE_SCORES = {2: 100, 3: 1000, 4: 10000}
+CLOSED_SHAPE_SCORES = {2: 10, 3: 100, 4: 1000, 5: 100000}
+# אורך חלון התבנית - חלון ניצחון ועוד תא, כדי לראות אם שני הקצוות פתוחים
+PATTERN_LENGTH = WIN_LENGTH + 1
+
+# ציוני קווים שכבר חושבו - לפי אורך הקו ואז לפי הקוד שלו
+_LINE_SCORES = {}
+# רמות איום שכבר חושבו - לפי אורך הקו ואז לפי (קוד, מיקום בקו)
+_LINE_THREATS = {}
+
+
+def shape_score(cells, own):
+    """ציון הצורה הטובה ביותר של צד אחד בחלון תבנית
+
+    חמש, ארבע, שלוש ושתיים נספרות בכל חלון ניצחון בתוך החלון שאין בו
+    חתיכה של היריב או חסימה, כולל צורות עם רווח כמו X_XX. כשגם שני הקצוות
+    ריקים הצורה פתוחה ומקבלת את הציון הגבוה יותר.
+    """
+    marks = [1 if val == own else 0 if val == EMPTY_CODE else -1 for val in cells]
+    best = 0
+    for start in range(PATTERN_LENGTH - WIN_LENGTH + 1):
+        window = marks[start:start + WIN_LENGTH]
+        if -1 not in window:
+            best = max(best, CLOSED_SHAPE_SCORES.get(sum(window), 0))
+    inner = marks[1:-1]
+    if marks[0] == 0 and marks[-1] == 0 and -1 not in inner:
+        best = max(best, OPEN_SHAPE_SCORES.get(sum(inner), 0))
+    return best
+
+
+def _build_pattern_scores():
+    """טבלת הציונים של כל חלונות התבנית - אינדקס לפי קוד החלון בבסיס 4"""
+    scores = []
+    for code in range(4 ** PATTERN_LENGTH):
+        cells = [code >> 2 * k & 3 for k in range(PATTERN_LENGTH)]
+        scores.append(shape_score(cells, WHITE_CODE) - shape_score(cells, BLACK_CODE))
+    return scores
+
+
+# נבנית פעם אחת בטעינת המודול - 4096 חלונות של 6 תאים
+PATTERN_SCORES = _build_pattern_scores()
+PATTERN_MASK = 4 ** PATTERN_LENGTH - 1
+
+
+def score_line(code, length):
+    """ציון קו שלם לפי הקוד שלו - סכום טבלת התבניות על כל חלון של PATTERN_LENGTH תאים
+
+    הקו מרופד בחסימה בכל קצה, כך שגבול הלוח סוגר צורות כמו חתיכה של היריב.
+    """
+    if length < WIN_LENGTH:
+        return 0
+    padded = BLOCK_CODE | code << 2 | BLOCK_CODE << 2 * (length + 1)
+    scores = PATTERN_SCORES
+    score = 0
+    for _ in range(length + 3 - PATTERN_LENGTH):
+        score += scores[padded & PATTERN_MASK]
+        padded >>= 2
+    return score
+
+
+def line_threats(code, length, pos):
+    """רמת האיום של תא בקו - לכל צד, מספר החתיכות המרבי בחלון ניצחון פתוח דרכו"""
+    cells = []
+    for _ in range(length):
+        cells.append(code % 4)
+        code //= 4
+    best = [0, 0]
+    for start in range(max(0, pos - WIN_LENGTH + 1), min(pos, length - WIN_LENGTH) + 1):
+        window = cells[start:start + WIN_LENGTH]
+        for side, own in ((0, BLACK_CODE), (1, WHITE_CODE)):
+            if all(val in (EMPTY_CODE, own) for val in window):
+                best[side] = max(best[side], window.count(own))
+    return tuple(best)
+
+
+class BitBoard:
+    """ייצוג ביטים של הלוח לחיפוש - מספר שלם לכל צד ואחד לחסימות
+
+    תא (row, col) נשמר בביט row * stride + col, כאשר stride = board_size + 1.
+    העמודה הנוספת תמיד ריקה ולכן הזזה לרוחב או באלכסון לא "גולשת" לשורה הבאה.
+
+    בנוסף נשמר קוד בבסיס 4 לכל שורה, עמודה ואלכסון, וציון ההערכה הכולל
+    מתעדכן בכל הנחה/הסרה רק עבור ארבעת הקווים שעוברים דרך התא.
+    hash הוא מפתח Zobrist של המצב ומתעדכן ב-XOR בכל שינוי של תא.
+    near_mask מסמן את התאים בסביבת החתיכות - המועמדים למהלך הבא. בהנחה
+    הסביבה של התא מתווספת ב-OR והערך הקודם נשמר במחסנית, כך שביטול מהלך
+    בחיפוש (שתמיד בסדר הפוך) רק שולף אותו חזרה.
+    """
+
+    _geometry_cache = {}
+
+    def __init__(self, board_size):
+        """יצירת לוח ביטים ריק ומסכות הכיוונים עבור גודל נתון"""
+        self.board_size = board_size
+        self.stride = board_size + 1
+        row_mask = (1 << board_size) - 1
+        self.full_mask = 0
+        for row in range(board_size):
+            self.full_mask |= row_mask << (row * self.stride)
+        (self.win_windows, self.cell_lines, line_count, self.zobrist,
+         self.neighbours, self.cell_threats) = self._build_geometry(board_size)
+        self.stones = [0, 0]
+        self.blocks = 0
+        self.line_codes = [0] * line_count
+        self.score = 0
+        self.hash = 0
+        self.near_mask = 0
+        self.near_stack = []
+
+    @classmethod
+    def _build_geometry(cls, board_size):
+        """חישוב מראש של חלונות הניצחון והקווים שעוברים דרך כל תא"""
+        if board_size in cls._geometry_cache:
+            return cls._geometry_cache[board_size]
+        stride = board_size + 1
+        windows = [[] for _ in range(board_size * stride)]
+        cell_lines = [[] for _ in range(board_size * stride)]
+        cell_threats = [[] for _ in range(board_size * stride)]
+        line_count = 0
+        for row in range(board_size):
+            for col in range(board_size):
+                for d_row, d_col in DIRECTIONS:
+                    end_r = row + d_row * (WIN_LENGTH - 1)
+                    end_c = col + d_col * (WIN_LENGTH - 1)
+                    if not (0 <= end_r < board_size and 0 <= end_c < board_size):
+                        continue
+                    cells = [(row + d_row * k) * stride + col + d_col * k for k in range(WIN_LENGTH)]
+                    mask = 0
+                    for idx in cells:
+                        mask |= 1 << idx
+                    for idx in cells:
+                        windows[idx].append(mask)
+        # כל קו מתחיל בתא שהתא שלפניו בכיוון הקו נמצא מחוץ ללוח
+        for d_row, d_col in DIRECTIONS:
+            for row in range(board_size):
+                for col in range(board_size):
+                    if 0 <= row - d_row < board_size and 0 <= col - d_col < board_size:
+                        continue
+                    cells = []
+                    r, c = row, col
+                    while 0 <= r < board_size and 0 <= c < board_size:
+                        cells.append(r * stride + c)
+                        r += d_row
+                        c += d_col
+                    table = _LINE_SCORES.setdefault(len(cells), {})
+                    threats = _LINE_THREATS.setdefault(len(cells), {})
+                    for pos, idx in enumerate(cells):
+                        cell_lines[idx].append((line_count, 4 ** pos, len(cells), table))
+                        if len(cells) >= WIN_LENGTH:
+                            cell_threats[idx].append((line_count, pos, len(cells), threats))
+                    line_count += 1
+        # מפתח Zobrist לכל תא ולכל קוד (שחור, לבן, חסימה)
+        rng = random.Random(ZOBRIST_SEED + board_size)
+        zobrist = [(0, rng.getrandbits(64), rng.getrandbits(64), rng.getrandbits(64))
+                   for _ in range(board_size * stride)]
+        # מסכת הסביבה של כל תא - כל התאים במרחק CANDIDATE_RADIUS ממנו
+        neighbours = [0] * (board_size * stride)
+        for row in range(board_size):
+            for col in range(board_size):
+                mask = 0
+                for r in range(max(0, row - CANDIDATE_RADIUS), min(board_size, row + CANDIDATE_RADIUS + 1)):
+                    for c in range(max(0, col - CANDIDATE_RADIUS), min(board_size, col + CANDIDATE_RADIUS + 1)):
+                        mask |= 1 << (r * stride + c)
+                neighbours[row * stride + col] = mask
+        cls._geometry_cache[board_size] = (windows, cell_lines, line_count, zobrist,
+                                           neighbours, cell_threats)
+        return cls._geometry_cache[board_size]
+
+    @classmethod
+    def from_grid(cls, board):
+        """בניית לוח ביטים מרשת תאים עם סימנים"""
+        bb = cls(len(board))
+        for row, cells in enumerate(board):
+            for col, val in enumerate(cells):
+                if val is None:
+                    continue
+                idx = bb.index(row, col)
+                if val == BLOCK_SYMBOL:
+                    bb.place_block(idx)
+                elif val in ('O', '⚪'):
+                    bb.place(idx, 1)
+                else:
+                    bb.place(idx, 0)
+        return bb
+
+    def index(self, row, col):
+        """מספר הביט של תא נתון"""
+        return row * self.stride + col
+
+    def cell(self, idx):
+        """המרת מספר ביט חזרה ל-(row, col)"""
+        return divmod(idx, self.stride)
+
+    def empty_mask(self):
+        """מסכת התאים הריקים בלוח"""
+        return self.full_mask & ~(self.stones[0] | self.stones[1] | self.blocks)
+
+    def candidate_cells(self):
+        """מעבר על התאים הריקים בסביבת החתיכות - המרכז כשאין חתיכות בלוח"""
+        empty = self.empty_mask()
+        candidates = self.near_mask & empty
+        if not candidates:
+            centre = self.index(self.board_size // 2, self.board_size // 2)
+            candidates = 1 << centre if empty >> centre & 1 else empty
+        while candidates:
+            low = candidates & -candidates
+            yield low.bit_length() - 1
+            candidates ^= low
+
+    def place(self, idx, side):
+        """הצבת חתיכה של צד נתון בביט נתון"""
+        self.stones[side] |= 1 << idx
+        self.hash ^= self.zobrist[idx][side + 1]
+        self._update_lines(idx, side + 1)
+        self.near_stack.append(self.near_mask)
+        self.near_mask |= self.neighbours[idx]
+
+    def remove(self, idx, side):
+        """הסרת חתיכה של צד נתון - ביטול המהלך האחרון שהונח"""
+        self.stones[side] &= ~(1 << idx)
+        self.hash ^= self.zobrist[idx][side + 1]
+        self._update_lines(idx, -(side + 1))
+        self.near_mask = self.near_stack.pop()
+
+    def place_block(self, idx):
+        """הצבת חסימה בביט נתון"""
+        self.blocks |= 1 << idx
+        self.hash ^= self.zobrist[idx][BLOCK_CODE]
+        self._update_lines(idx, BLOCK_CODE)
+
+    def clear_cell(self, idx):
+        """ריקון תא מכל תוכן - חתיכה של כל צד או חסימה (פצצה)"""
+        bit = 1 << idx
+        for side in (0, 1):
+            if self.stones[side] & bit:
+                self.stones[side] &= ~bit
+                self.hash ^= self.zobrist[idx][side + 1]
+                self._update_lines(idx, -(side + 1))
+                self._rebuild_near_mask()
+        if self.blocks & bit:
+            self.blocks &= ~bit
+            self.hash ^= self.zobrist[idx][BLOCK_CODE]
+            self._update_lines(idx, -BLOCK_CODE)
+
+    def _rebuild_near_mask(self):
+        """חישוב מחדש של סביבת החתיכות - אחרי הסרה שאינה ביטול מהלך"""
+        self.near_mask = 0
+        self.near_stack = []
+        stones = self.stones[0] | self.stones[1]
+        while stones:
+            low = stones & -stones
+            self.near_mask |= self.neighbours[low.bit_length() - 1]
+            stones ^= low
+
+    def _update_lines(self, idx, delta):
+        """עדכון קודי הקווים שעוברים דרך התא וציון ההערכה לפי ההפרש בלבד"""
+        codes = self.line_codes
+        for line, weight, length, table in self.cell_lines[idx]:
+            old = codes[line]
+            new = old + delta * weight
+            codes[line] = new
+            old_score = table.get(old)
+            if old_score is None:
+                old_score = table[old] = score_line(old, length)
+            new_score = table.get(new)
+            if new_score is None:
+                new_score = table[new] = score_line(new, length)
+            self.score += new_score - old_score
+
+    def copy(self):
+        """העתק עצמאי של הלוח - נתוני הגאומטריה משותפים, התוכן לא"""
+        clone = BitBoard.__new__(BitBoard)
+        clone.__dict__.update(self.__dict__)
+        clone.stones = list(self.stones)
+        clone.line_codes = list(self.line_codes)
+        clone.near_stack = list(self.near_stack)
+        return clone
+
+    def threats_at(self, idx):
+        """רמת האיום בתא ריק לכל צד - כמה חתיכות יהיו בחלון הניצחון הטוב ביותר דרכו"""
+        codes = self.line_codes
+        black = white = 0
+        for line, pos, length, table in self.cell_threats[idx]:
+            key = codes[line] * 32 + pos
+            threat = table.get(key)
+            if threat is None:
+                threat = table[key] = line_threats(codes[line], length, pos)
+            if threat[0] > black:
+                black = threat[0]
+            if threat[1] > white:
+                white = threat[1]
+        return black, white
+
+    def win_cells_through(self, idx, side):
+        """התאים הריקים שישלימו ניצחון לצד נתון בחלון שעובר דרך הביט idx"""
+        own = self.stones[side]
+        dead = self.stones[1 - side] | self.blocks
+        cells = []
+        for window in self.win_windows[idx]:
+            if not window & dead and (window & own).bit_count() == WIN_LENGTH - 1:
+                gap = (window & ~own).bit_length() - 1
+                if gap not in cells:
+                    cells.append(gap)
+        return cells
+
+    def is_win_at(self, idx, side):
+        """בדיקת ניצחון רק בקווים שעוברים דרך החתיכה שהונחה בביט idx"""
+        own = self.stones[side]
+        for window in self.win_windows[idx]:
+            if own & window == window:
+                return True
+        return False
+
+
+# סוגי הגבול של ציון שנשמר בטבלת הטרנספוזיציה
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# מפתח שמתווסף ל-hash כשהתור של ה-AI (הצד הממקסם)
+SIDE_KEY = random.Random(ZOBRIST_SEED).getrandbits(64)
+
+
+class TranspositionTable:
+    """טבלת טרנספוזיציה לפי מפתחות Zobrist - דליים של שתי רשומות
+
+    הרשומה הראשונה בכל דלי מעדיפה עומק - מוחלפת רק בחיפוש עמוק או שווה לה,
+    והשנייה מוחלפת תמיד. כך תוצאות יקרות לא נדרסות על ידי צמתים רדודים.
+    """
+
+    def __init__(self, size=TT_SIZE):
+        """יצירת טבלה ריקה - size מעוגל מטה לחזקה של 2"""
+        buckets = 1
+        while buckets * 4 <= size:
+            buckets *= 2
+        self.mask = buckets - 1
+        self.entries = [None] * (buckets * 2)
+        # מונים מצטברים - משמשים למדידת אחוז הפגיעות
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        """מחיקת כל הרשומות - למשל במעבר ללוח חדש"""
+        self.entries = [None] * len(self.entries)
+
+    def probe(self, key):
+        """חיפוש רשומה לפי מפתח - מחזיר (key, depth, flag, score, move) או None"""
+        self.probes += 1
+        slot = (key & self.mask) * 2
+        entry = self.entries[slot]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self.entries[slot + 1]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        """שמירת תוצאת חיפוש - עדיפות לעומק ברשומה הראשונה, החלפה תמידית בשנייה"""
+        slot = (key & self.mask) * 2
+        first = self.entries[slot]
+        if first is None or first[0] == key or depth >= first[1]:
+            self.entries[slot] = (key, depth, flag, score, move)
+        else:
+            self.entries[slot + 1] = (key, depth, flag, score, move)
+
+
+class SearchTimeout(Exception):
+    """נזרק מתוך minimax כשתקציב הזמן של האיטרציה הנוכחית נגמר או שהחיפוש בוטל"""
+
+
+class SearchStats:
+    """מוני חיפוש אופציונליים - נאספים רק כשמציבים מופע ב-engine.stats
+
+    המונים מצטברים עד reset. trace מתאר את המהלך האחרון בלבד - רשומה לכל
+    איטרציה של ההעמקה, או רשומה אחת כשהמהלך נמצא לפני החיפוש (ניצחון מיידי
+    או VCF). phase_times מחלק את זמן minimax בין שלבי הצומת, בשניות.
+    """
+
+    PHASES = ('win_check', 'full_check', 'evaluate', 'tt', 'ordering')
+
+    def __init__(self):
+        """מונים ריקים"""
+        self.reset()
+
+    def reset(self):
+        """איפוס כל המונים והמעקב"""
+        self.nodes = 0
+        self.cutoffs = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.max_ply = 0
+        self.phase_times = dict.fromkeys(self.PHASES, 0.0)
+        self.trace = []
+
+    def summary(self):
+        """סיכום המונים כמילון - זמני השלבים במילישניות"""
+        return {
+            'nodes': self.nodes,
+            'cutoffs': self.cutoffs,
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'tt_hit_rate': round(self.tt_hits / self.tt_probes, 4) if self.tt_probes else 0.0,
+            'max_ply': self.max_ply,
+            'phase_ms': {phase: round(t * 1000, 2) for phase, t in self.phase_times.items()},
+        }
+
+    def format_trace(self):
+        """המעקב של המהלך האחרון כשורות טקסט - ללוג או לשכבת דיבאג"""
+        lines = []
+        for step in self.trace:
+            if step['source'] != 'search':
+                lines.append(f"{step['source']}: {step['move']} ({step['ms']:.1f} ms)")
+            else:
+                lines.append(f"depth {step['depth']}: {step['move']} score {step['score']} "
+                             f"nodes {step['nodes']} ({step['ms']:.1f} ms)")
+        return '\n'.join(lines)
+
+
+class GomokuEngine:
+    """מנוע החיפוש של ה-AI - minimax, פונקציית הערכה ובחירת פעולות מיוחדות"""
+
+    def __init__(self, tt_size=TT_SIZE, workers=AI_WORKERS):
+        """יצירת מנוע עם טבלת טרנספוזיציה בגודל נתון ומספר תהליכי חיפוש"""
+        self.tt = TranspositionTable(tt_size)
+        self.workers = workers
+        self.parallel = None
+        # הפותר המדויק ללוחות קטנים - נוצר בפעם הראשונה שצריך אותו
+        self.solver = None
+        self.deadline = None
+        # נקבע מתהליכון אחר כדי לעצור חיפוש שרץ ברקע
+        self.stop_requested = False
+        self.nodes = 0
+        # SearchStats לאיסוף מונים - None כברירת מחדל כדי שהחיפוש לא ישלם עליהם
+        self.stats = None
+        self.killers = []
+        self.history = {}
+
+    def new_game(self):
+        """איפוס הזיכרון של החיפוש לפני סיבוב חדש"""
+        self.tt.clear()
+        self.history = {}
+        if self.solver is not None:
+            self.solver.memo.clear()
+
+    def find_best_move(self, state, think_ms=AI_THINK_MS):
+        """מציאת המהלך הטוב ביותר עבור AI - העמקה הדרגתית בתוך תקציב זמן
+
+        כל איטרציה מחפשת לעומק גדול ב-1 מהקודמת. כשהזמן נגמר באמצע איטרציה
+        היא נזנחת ומוחזר המהלך הטוב ביותר מהאיטרציה האחרונה שהושלמה.
+        """
+        stats = self.stats
+        start = time.perf_counter()
+        if stats is not None:
+            stats.trace = []
+        # לוח עבודה יחיד - כל מועמד מונח ומוסר עליו במקום, ללא העתקות
+        bb = state.bitboard.copy()
+        for side in (1, 0):
+            for idx in bb.candidate_cells():
+                bb.place(idx, side)
+                won = bb.is_win_at(idx, side)
+                bb.remove(idx, side)
+                if won:
+                    if stats is not None:
+                        stats.trace.append({'source': 'immediate', 'move': bb.cell(idx),
+                                            'ms': (time.perf_counter() - start) * 1000})
+                    return bb.cell(idx)
+
+        deadline = start + think_ms / 1000
+        # לוח קטן נפתר עד הסוף - החיפוש ההיוריסטי רק כשהפותר לא הספיק, בזמן שנשאר לו
+        exact = self.solve_exact(state, start + think_ms * SOLVER_TIME_SHARE / 1000)
+        if exact is not None:
+            if stats is not None:
+                stats.trace.append({'source': 'solver', 'move': exact,
+                                    'ms': (time.perf_counter() - start) * 1000})
+            return exact
+
+        # ניצחון כפוי ברצף של ארבעות זול בהרבה מחיפוש ברוחב מלא
+        sequence = self.solve_vcf(bb, 1, deadline)
+        if sequence:
+            if stats is not None:
+                stats.trace.append({'source': 'vcf', 'move': bb.cell(sequence[0]),
+                                    'ms': (time.perf_counter() - start) * 1000})
+            return bb.cell(sequence[0])
+
+        # אם החיפוש על זמן היריב כבר הגיע לעמדה הזו, המהלך שמצא נבדק ראשון
+        tt_move = self.tt_move(bb, True)
+        moves = self.order_root_moves(bb, tt_move)
+        if not moves:
+            return None
+        # מהלכי killer מתחילים מחדש בכל תור, וההיסטוריה דועכת בהדרגה
+        self.killers = [[None, None] for _ in range(AI_MAX_DEPTH + 1)]
+        self.history = {key: value // 2 for key, value in self.history.items() if value > 1}
+        best_move = None
+        for depth in range(1, min(AI_MAX_DEPTH, bb.empty_mask().bit_count()) + 1):
+            # האיטרציה הראשונה תמיד מושלמת כדי שיהיה מהלך להחזיר
+            self.deadline = deadline if best_move is not None else None
+            nodes = self.nodes
+            try:
+                move, score = self.search_iteration(state, bb, moves, depth)
+            except SearchTimeout:
+                break
+            finally:
+                self.deadline = None
+            best_move = move
+            if stats is not None:
+                stats.trace.append({'source': 'search', 'depth': depth, 'move': bb.cell(move), 'score': score,
+                                    'nodes': self.nodes - nodes, 'ms': (time.perf_counter() - start) * 1000})
+            # המהלך הטוב ביותר נבדק ראשון באיטרציה הבאה
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(score) >= WIN_SCORE or time.perf_counter() >= deadline:
+                break
+        if best_move is None:
+            return None
+        return bb.cell(best_move)
+
+    def solve_exact(self, state, deadline=None):
+        """מהלך מהפותר המדויק ללוח קטן - או None כשהלוח גדול או שהזמן נגמר"""
+        # ייבוא מקומי - solver מייבא את המנוע בעצמו
+        from solver import ExactSolver, SOLVER_MAX_SIZE
+        if state.board_size > SOLVER_MAX_SIZE:
+            return None
+        if self.solver is None or self.solver.size != state.board_size:
+            self.solver = ExactSolver(state)
+        self.solver.stop_requested = lambda: self.stop_requested or \
+            (deadline is not None and time.perf_counter() >= deadline)
+        bb = state.bitboard
+        self.killers = [[None, None] for _ in range(AI_MAX_DEPTH + 1)]
+        order = self.order_moves(bb, list(bb.candidate_cells()), 1, 0, None)
+        return self.solver.choose(state, 1, order)
+
+    def ponder(self, state):
+        """חיפוש על זמן היריב - העמקה הדרגתית מהעמדה שבה השחקן לפני מהלך
+
+        לא מחזיר מהלך. התוצאות נשמרות בטבלת הטרנספוזיציה, כך שהחיפוש האמיתי
+        אחרי שהשחקן משחק מוצא את תתי-העצים שכבר נבדקו. רץ עד ש-stop_requested
+        נקבע או עד AI_MAX_DEPTH.
+        """
+        bb = state.bitboard.copy()
+        self.killers = [[None, None] for _ in range(AI_MAX_DEPTH + 2)]
+        for depth in range(1, min(AI_MAX_DEPTH, bb.empty_mask().bit_count()) + 1):
+            try:
+                self.minimax(bb, depth, False, float('-inf'), float('inf'))
+            except SearchTimeout:
+                return
+
+    def tt_key(self, bb, maximizing):
+        """מפתח הטבלה לעמדה - (מפתח, סימטריה) כשהעמדה מוקדמת, אחרת (hash, 0)
+
+        עד SYMMETRY_MAX_STONES תאים תפוסים המפתח קנוני, כך שעמדות שקולות
+        חולקות רשומה. המהלך ברשומה נשמר אז במערכת הצירים הקנונית.
+        """
+        if (bb.stones[0] | bb.stones[1] | bb.blocks).bit_count() <= SYMMETRY_MAX_STONES:
+            key, sym = canonical_hash(bb)
+        else:
+            key, sym = bb.hash, 0
+        return (key ^ SIDE_KEY if maximizing else key), sym
+
+    def tt_move(self, bb, maximizing):
+        """המהלך השמור בטבלה לעמדה, במערכת הצירים של הלוח - או None"""
+        key, sym = self.tt_key(bb, maximizing)
+        entry = self.tt.probe(key)
+        if entry is None or entry[4] is None:
+            return None
+        return map_cell(bb, entry[4], INVERSE[sym]) if sym else entry[4]
+
+    def search_fixed_depth(self, state, depth):
+        """חיפוש יחיד לעומק קבוע ללא תקציב זמן - להשוואה בין מצבי חיפוש"""
+        bb = state.bitboard.copy()
+        moves = self.order_root_moves(bb, None)
+        if not moves:
+            return None
+        self.killers = [[None, None] for _ in range(AI_MAX_DEPTH + 1)]
+        move, _ = self.search_iteration(state, bb, moves, depth)
+        return bb.cell(move)
+
+    def search_iteration(self, state, bb, moves, depth):
+        """איטרציה אחת של החיפוש בשורש - סדרתית או מפוזרת בין תהליכים לפי workers"""
+        if self.workers <= 1:
+            return self.search_root(bb, moves, depth)
+        if self.parallel is None:
+            # ייבוא מקומי - parallel_search מייבא את המנוע בעצמו
+            from parallel_search import ParallelSearcher
+            self.parallel = ParallelSearcher(self.workers)
+        wall_deadline = None
+        if self.deadline is not None:
+            wall_deadline = time.time() + (self.deadline - time.perf_counter())
+        return self.parallel.search_root(self, state.board, moves, depth, wall_deadline)
+
+    def search_root(self, bb, moves, depth):
+        """חיפוש בשורש לעומק נתון - מחזיר (מהלך, ציון) עבור ה-AI"""
+        best_score = float('-inf')
+        best_move = None
+        for idx in moves:
+            bb.place(idx, 1)
+            score = self.minimax(bb, depth - 1, False, best_score, float('inf'), idx, 1)
+            bb.remove(idx, 1)
+            if score > best_score:
+                best_score = score
+                best_move = idx
+        return best_move, best_score
+
+    def find_vcf(self, state, side=1, deadline=None):
+        """חיפוש ניצחון כפוי (VCF) במצב המשחק - רשימת תאים לסירוגין או None
+
+        הרשימה מתחילה במהלך של התוקף וממשיכה בתגובה הכפויה של היריב וכן הלאה,
+        עד הארבע האחרונה שאי אפשר לחסום.
+        """
+        bb = state.bitboard.copy()
+        sequence = self.solve_vcf(bb, side, deadline)
+        if sequence is None:
+            return None
+        return [bb.cell(idx) for idx in sequence]
+
+    def solve_vcf(self, bb, side, deadline=None):
+        """פתרון VCF (ניצחון בארבעות רצופות) עבור side - רשימת ביטים או None
+
+        התוקף משחק רק מהלכים שיוצרים ארבע, ולכן ליריב יש תגובה אחת - לחסום את
+        התא החסר (באבן או בחסימה, שהן שקולות כאן). שימוש בפצצה של היריב לא נלקח
+        בחשבון. החיפוש מוגבל ב-VCF_MAX_NODES צמתים ובזמן deadline.
+        """
+        self.vcf_nodes = 0
+        self.vcf_deadline = deadline
+        self.vcf_failed = set()
+        return self._vcf(bb, side, None, VCF_MAX_DEPTH)
+
+    def _vcf(self, bb, side, forced, depth):
+        """שלב ברקורסיית ה-VCF - forced הוא תא שהתוקף חייב לחסום (ארבע של היריב)"""
+        if depth == 0 or bb.hash in self.vcf_failed:
+            return None
+        self.vcf_nodes += 1
+        if self.vcf_nodes > VCF_MAX_NODES:
+            return None
+        if self.stop_requested:
+            return None
+        if self.vcf_deadline is not None and time.perf_counter() > self.vcf_deadline:
+            return None
+        opp = 1 - side
+        if forced is not None:
+            moves = [forced]
+        else:
+            moves = [idx for idx in bb.candidate_cells() if bb.threats_at(idx)[side] == WIN_LENGTH - 2]
+        for idx in moves:
+            bb.place(idx, side)
+            if bb.is_win_at(idx, side):
+                bb.remove(idx, side)
+                return [idx]
+            gains = bb.win_cells_through(idx, side)
+            if len(gains) >= 2:
+                # ארבע פתוחה או ארבע כפולה - אי אפשר לחסום את שני התאים
+                bb.remove(idx, side)
+                return [idx]
+            line = None
+            if gains:
+                reply = gains[0]
+                bb.place(reply, opp)
+                # החסימה עלולה לתת ליריב חמש או ארבע משלו
+                counter = bb.win_cells_through(reply, opp)
+                if not bb.is_win_at(reply, opp) and len(counter) <= 1:
+                    line = self._vcf(bb, side, counter[0] if counter else None, depth - 1)
+                bb.remove(reply, opp)
+                if line is not None:
+                    line = [reply] + line
+            bb.remove(idx, side)
+            if line is not None:
+                return [idx] + line
+        self.vcf_failed.add(bb.hash)
+        return None
+
+    def minimax(self, bb, depth, maximizing, alpha, beta, last_move=None, ply=0):
+        """אלגוריתם minimax עם alpha-beta pruning לחישוב המהלך הטוב ביותר
+
+        last_move הוא הביט של החתיכה האחרונה שהונחה - ניצחון יכול להיווצר רק
+        בקווים שעוברים דרכה, ולכן אין צורך לסרוק את כל הלוח בכל צומת.
+        ply הוא המרחק מהשורש - משמש את טבלת מהלכי ה-killer.
+        """
+        self.nodes += 1
+        if not self.nodes & 1023:
+            if self.stop_requested:
+                raise SearchTimeout()
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                raise SearchTimeout()
+        stats = self.stats
+        if stats is not None:
+            score = self.trace_leaf(stats, bb, depth, maximizing, last_move, ply)
+            if score is not None:
+                return score
+        else:
+            if last_move is not None:
+                # הצד שהניח את החתיכה האחרונה הוא היריב של הצד שתורו עכשיו
+                if bb.is_win_at(last_move, 0 if maximizing else 1):
+                    return -WIN_SCORE if maximizing else WIN_SCORE
+            if not bb.empty_mask():
+                return 0
+            if depth == 0:
+                return self.evaluate_board(bb)
+
+        if stats is not None:
+            t = time.perf_counter()
+        # כמו tt_key, בתוך הצומת כדי לחסוך קריאה
+        if (bb.stones[0] | bb.stones[1] | bb.blocks).bit_count() <= SYMMETRY_MAX_STONES:
+            key, sym = canonical_hash(bb)
+        else:
+            key, sym = bb.hash, 0
+        if maximizing:
+            key ^= SIDE_KEY
+        entry = self.tt.probe(key)
+        if stats is not None:
+            stats.phase_times['tt'] += time.perf_counter() - t
+            stats.tt_probes += 1
+            stats.tt_hits += entry is not None
+        tt_move = None
+        if entry is not None:
+            _, entry_depth, flag, score, tt_move = entry
+            if sym and tt_move is not None:
+                tt_move = map_cell(bb, tt_move, INVERSE[sym])
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return score
+                elif flag == LOWER:
+                    alpha = max(alpha, score)
+                elif flag == UPPER:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score
+        alpha_orig, beta_orig = alpha, beta
+
+        side = 1 if maximizing else 0
+        if stats is not None:
+            t = time.perf_counter()
+        moves = self.order_moves(bb, list(bb.candidate_cells()), side, ply, tt_move, depth >= 2)
+        if stats is not None:
+            stats.phase_times['ordering'] += time.perf_counter() - t
+
+        best_move = None
+        if maximizing:
+            best = float('-inf')
+            for idx in moves:
+                bb.place(idx, 1)
+                eval = self.minimax(bb, depth-1, False, alpha, beta, idx, ply+1)
+                bb.remove(idx, 1)
+                if eval > best:
+                    best = eval
+                    best_move = idx
+                alpha = max(alpha, eval)
+                if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break
+        else:
+            best = float('inf')
+            for idx in moves:
+                bb.place(idx, 0)
+                eval = self.minimax(bb, depth-1, True, alpha, beta, idx, ply+1)
+                bb.remove(idx, 0)
+                if eval < best:
+                    best = eval
+                    best_move = idx
+                beta = min(beta, eval)
+                if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break
+
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta_orig:
+            flag = LOWER
+            # מהלך שגרם לחיתוך - נשמר כ-killer לעומק הזה ומקבל ניקוד היסטוריה
+            killers = self.killers[ply] if ply < len(self.killers) else None
+            if killers is not None and killers[0] != best_move:
+                killers[1] = killers[0]
+                killers[0] = best_move
+            history_key = best_move * 2 + side
+            self.history[history_key] = self.history.get(history_key, 0) + depth * depth
+        else:
+            flag = EXACT
+        if stats is not None:
+            t = time.perf_counter()
+        if sym and best_move is not None:
+            best_move = map_cell(bb, best_move, sym)
+        self.tt.store(key, depth, flag, best, best_move)
+        if stats is not None:
+            stats.phase_times['tt'] += time.perf_counter() - t
+        return best
+
+    def trace_leaf(self, stats, bb, depth, maximizing, last_move, ply):
+        """בדיקות העלה של minimax עם מדידת זמן לכל שלב - רק כש-stats מוגדר
+
+        מחזיר את ציון העלה, או None אם הצומת ממשיך לחיפוש בילדים.
+        """
+        clock = time.perf_counter
+        times = stats.phase_times
+        stats.nodes += 1
+        if ply > stats.max_ply:
+            stats.max_ply = ply
+        if last_move is not None:
+            t = clock()
+            won = bb.is_win_at(last_move, 0 if maximizing else 1)
+            times['win_check'] += clock() - t
+            if won:
+                return -WIN_SCORE if maximizing else WIN_SCORE
+        t = clock()
+        full = not bb.empty_mask()
+        times['full_check'] += clock() - t
+        if full:
+            return 0
+        if depth == 0:
+            t = clock()
+            score = self.evaluate_board(bb)
+            times['evaluate'] += clock() - t
+            return score
+        return None
+
+    def order_root_moves(self, bb, tt_move):
+        """סידור מהלכי השורש - בתוך כל רמת איום לפי ציון ההערכה אחרי המהלך
+
+        בעמדה סימטרית מהלכים שקולים נבדקים פעם אחת.
+        """
+        moves = unique_moves(bb, list(bb.candidate_cells()))
+        return self.order_moves(bb, moves, 1, 0, tt_move, scores=self.root_scores(bb, moves))
+
+    def root_scores(self, bb, moves):
+        """ציון ההערכה אחרי כל מהלך של הלבן - בבת אחת ב-NumPy כשיש מספיק מועמדים"""
+        if len(moves) >= VECTOR_MIN_MOVES:
+            # ייבוא מקומי - vector_eval מייבא את המנוע בעצמו
+            from vector_eval import HAVE_NUMPY, score_moves
+            if HAVE_NUMPY:
+                return dict(zip(moves, score_moves(bb, moves, 1)))
+        scores = {}
+        for idx in moves:
+            bb.place(idx, 1)
+            scores[idx] = bb.score
+            bb.remove(idx, 1)
+        return scores
+
+    def order_moves(self, bb, moves, side, ply, tt_move, with_threats=True, scores=None):
+        """סידור מהלכים לפי איומים, טבלת הטרנספוזיציה, killers והיסטוריה
+
+        הסדר: ניצחון מיידי, חסימת ארבע של היריב, יצירת ארבע, חסימת שלוש
+        של היריב, יצירת שלוש, המהלך מהטבלה, מהלכי killer ולבסוף ניקוד
+        ההיסטוריה. האיומים נמדדים בחלונות הניצחון שעוברים דרך התא.
+        with_threats=False מדלג על מדידת האיומים - בצמתים שילדיהם עלים
+        הסידור הזול משתלם יותר מהחיתוכים הנוספים. scores (מהלך -> ציון
+        הערכה) שובר שוויון בתוך כל רמה לפני ההיסטוריה.
+        """
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history
+        keyed = []
+        for idx in moves:
+            if with_threats:
+                threats = bb.threats_at(idx)
+                attack = threats[side]
+                defend = threats[1 - side]
+            else:
+                attack = defend = 0
+            if attack == 4:
+                tier = 8
+            elif defend == 4:
+                tier = 7
+            elif attack == 3:
+                tier = 6
+            elif defend == 3:
+                tier = 5
+            elif attack == 2:
+                tier = 4
+            elif idx == tt_move:
+                tier = 3
+            elif idx in killers:
+                tier = 2
+            else:
+                tier = 0
+            static = scores[idx] if scores is not None else 0
+            keyed.append((tier, static, history.get(idx * 2 + side, 0), idx))
+        keyed.sort(reverse=True)
+        return [idx for _, _, _, idx in keyed]
+
+    def evaluate_board(self, bb):
+        """הערכת מצב הלוח - הציון המצטבר שמתעדכן בכל הנחה והסרה של חתיכה"""
+        return bb.score
+
+    def find_dangerous_cell(self, state):
+        """מציאת תא מסוכן לחסימה - AI מחפש רצפים של 4+ חתיכות"""
+        board = state.board
+        size = state.board_size
+        for row in range(size):
+            for col in range(size):
+                if board[row][col] is not None:
+                    continue
+                for d_row, d_col in DIRECTIONS:
+                    count = 0
+                    r, c = row + d_row, col + d_col
+                    while 0 <= r < size and 0 <= c < size and board[r][c] in ('X', '⚫'):
+                        count += 1
+                        r += d_row
+                        c += d_col
+                    r, c = row - d_row, col - d_col
+                    while 0 <= r < size and 0 <= c < size and board[r][c] in ('X', '⚫'):
+                        count += 1
+                        r -= d_row
+                        c -= d_col
+                    if count >= 4:
+                        return (row, col)
+        return None
+
+    def find_bomb_target(self, state):
+        """מציאת יעד לפצצה - AI מחפש אזורים צפופים לניקוי"""
+        board = state.board
+        best_target = None
+        max_score = 0
+
+        for row in range(state.board_size):
+            for col in range(state.board_size):
+                for bomb_type in ['col', 'row', 'diag1', 'diag2']:
+                    bomb_cells = state.get_bombed_cells(row, col, bomb_type)
+                    score = 0
+                    for r, c in bomb_cells:
+                        if board[r][c] in ('X', '⚫'):
+                            score += 2
+                        elif board[r][c] in ('O', '⚪'):
+                            score -= 1
+                    if score > max_score and score >= 6:
+                        max_score = score
+                        best_target = (row, col, bomb_type)
+
+        return best_target
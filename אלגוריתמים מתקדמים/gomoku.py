@@ -1,11 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
-import copy
-import threading
-import random
-import sys
 import os
+import time
 from PIL import Image, ImageTk, ImageDraw, ImageFilter
+from engine import GameState, GomokuEngine, SearchStats, PLAYER_SYMBOLS, BLOCK_SYMBOL, MAX_BLOCKS
+from search_worker import SearchWorker
+from opening_book import OpeningBook
+from solver import SOLVER_MAX_SIZE
 
 try:
     import winsound
@@ -20,12 +21,12 @@ except ImportError:
         def play_click_sound():
             pass
 
-PLAYER_SYMBOLS = ['⚫', '⚪']
-WIN_LENGTH = 5
-AI_DEPTH = 2
 AI_DELAY = 0.3
-BLOCK_SYMBOL = '🚫'
-MAX_BLOCKS = 3
+AI_POLL_MS = 20  # תדירות הבדיקה אם חיפוש הרקע של ה-AI הסתיים
+RESIZE_SETTLE_MS = 80  # ציור מחדש אחרי שהחלון הפסיק לשנות גודל
+RESIZE_MAX_WAIT_MS = 250  # בגרירה ארוכה - ציור לפחות פעם בפרק זמן זה
+AI_PONDER = True  # חיפוש ברקע בזמן שהשחקן חושב - מחמם את טבלת הטרנספוזיציה
+AI_DEBUG = False  # הדפסת מעקב החיפוש ומוני המנוע אחרי כל מהלך של ה-AI
 WIN_POINTS = 3
 TIE_POINTS = 1
 LOSS_POINTS = 0
@@ -172,7 +173,18 @@ class GomokuGUI:
         self.current_player = 0
         self.rounds = 0
         self.set_board_size()
-        self.board = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
+        self.state = GameState(self.board_size)
+        self.engine = GomokuEngine()
+        if AI_DEBUG:
+            self.engine.stats = SearchStats()
+        self.worker = SearchWorker(self.engine)
+        self.book = OpeningBook.load()
+        self.ai_thinking = False
+        self._sprite_cache = {}  # (גודל, סוג) -> PhotoImage מוכן לציור
+        self._resize_job = None
+        self._resize_started = 0.0
+        self.animating = False  # אנימציה רצה - הקלט חסום עד שתסתיים
+        self._animation_job = None
         self.buttons = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
         self.game_over = False
         self.block_mode = False
@@ -240,7 +252,7 @@ class GomokuGUI:
         
         self.draw_modern_board()
         self.board_canvas.bind('<Button-1>', self.handle_canvas_click)
-        self.board_canvas.bind('<Configure>', lambda e: self.draw_modern_board())
+        self.board_canvas.bind('<Configure>', self.on_canvas_resize)
         
         self.buttons_frame = tk.Frame(root, bg='#C172F5')
         self.buttons_frame.pack(pady=10)
@@ -255,6 +267,11 @@ class GomokuGUI:
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f'{width}x{height}+{x}+{y}')
 
+    @property
+    def board(self):
+        """רשת התאים של הלוח הנוכחי - מגיעה ממצב המנוע"""
+        return self.state.board
+
     def draw_window_gradient(self):
         """הגדרת רקע הסגול הבהיר על כל החלון במשחק"""
         self.bg_canvas.configure(bg='#C172F5')
@@ -377,11 +394,15 @@ class GomokuGUI:
 
     def handle_click(self, row, col):
         """טיפול בלחיצה על תא בלוח - בדיקת מצב המשחק ופעולה מתאימה"""
+        if self.ai_thinking or self.animating:
+            return
         if self.double_move_active[self.current_player]:
             if self.game_over:
                 return
             if self.board[row][col] is not None:
                 return
+            # מהלך של השחקן משנה את הלוח - קודם עוצרים את החיפוש על זמנו
+            self.stop_pondering()
             self.make_move(row, col, self.current_player, skip_switch=True)
             self.double_move_counter += 1
             if self.double_move_counter < 2:
@@ -406,6 +427,7 @@ class GomokuGUI:
             return
         if not self.blocks_left[self.current_player] <= 0 and self.last_action[self.current_player] == 'block':
             return
+        self.stop_pondering()
         self.make_move(row, col, 0)
         self.last_action[0] = 'move'
         if not self.game_over:
@@ -417,7 +439,8 @@ class GomokuGUI:
             return
         if self.blocks_left[self.current_player] <= 0:
             return
-        self.board[row][col] = BLOCK_SYMBOL
+        self.stop_pondering()
+        self.state.place(row, col, BLOCK_SYMBOL)
         self.blocks_left[self.current_player] -= 1
         if self.current_player == 0:
             self.update_option_buttons_for(0)
@@ -431,7 +454,7 @@ class GomokuGUI:
             self.root.after(int(AI_DELAY * 1000), self.ai_move)
         elif self.current_player == 0 and not self.game_over:
             self.last_action[0] = 'move'
-        self.draw_modern_board()
+        self.update_cells([(row, col)])
 
     def use_bomb(self, row, col, bomb_type='col'):
         """שימוש בפצצה - ניקוי שורה, עמודה או אלכסון מהלוח"""
@@ -439,32 +462,16 @@ class GomokuGUI:
             self.bomb_mode = False
             self.bomb_button_canvas.itemconfig(1, fill='#E8E4F3')
             return
-        bomb_cells = self.get_bombed_cells(row, col, bomb_type)
-        
-        # Show bomb emoji first
-        for r, c in bomb_cells:
-            if hasattr(self, 'board_offset_x') and hasattr(self, 'cell_size'):
-                x0 = self.board_offset_x + BOARD_PADDING + c * self.cell_size
-                y0 = self.board_offset_y + BOARD_PADDING + r * self.cell_size
-                font_size = max(20, self.cell_size // 2)
-                self.board_canvas.create_text(x0 + self.cell_size//2, y0 + self.cell_size//2, text='💣', font=("Apple Color Emoji", font_size), fill='black', tags='bomb_effect')
-        self.root.update()
-        self.root.after(350)
-        self.board_canvas.delete('bomb_effect')
+        self.stop_pondering()
+        bomb_cells = self.state.get_bombed_cells(row, col, bomb_type)
         
-        # Show explosion emoji
-        for r, c in bomb_cells:
-            if hasattr(self, 'board_offset_x') and hasattr(self, 'cell_size'):
-                x0 = self.board_offset_x + BOARD_PADDING + c * self.cell_size
-                y0 = self.board_offset_y + BOARD_PADDING + r * self.cell_size
-                font_size = max(20, self.cell_size // 2)
-                self.board_canvas.create_text(x0 + self.cell_size//2, y0 + self.cell_size//2, text='💥', font=("Apple Color Emoji", font_size), fill='red', tags='explosion_effect')
-        self.root.update()
-        self.root.after(350)
-        self.board_canvas.delete('explosion_effect')
-        
-        for r, c in bomb_cells:
-            self.board[r][c] = None
+        # Show bomb emoji first, then explosion - the board clears when the animation ends
+        self.play_animation([(bomb_cells, '💣', 'black', 350), (bomb_cells, '💥', 'red', 350)],
+                            lambda: self.finish_bomb(bomb_cells))
+
+    def finish_bomb(self, bomb_cells):
+        """המשך הפצצה של השחקן אחרי האנימציה - ניקוי התאים והעברת התור"""
+        self.state.clear_cells(bomb_cells)
         self.bomb_used[self.current_player] = True
         if self.current_player == 0:
             self.update_option_buttons_for(0)
@@ -480,53 +487,18 @@ class GomokuGUI:
             self.bomb_type_frame.destroy()
         if hasattr(self, 'bomb_type'):
             del self.bomb_type
-        self.draw_modern_board()
-
-    def get_bombed_cells(self, row, col, bomb_type):
-        """קבלת רשימת התאים שיינקו על ידי הפצצה לפי סוגה"""
-        if bomb_type == 'col':
-            return [(r, col) for r in range(self.board_size)]
-        elif bomb_type == 'row':
-            return [(row, c) for c in range(self.board_size)]
-        elif bomb_type == 'diag1':  # ↘ main diagonal through (row, col)
-            cells = []
-            # Go to the top-left of the diagonal
-            r, c = row, col
-            while r > 0 and c > 0:
-                r -= 1
-                c -= 1
-            # Collect all cells along the diagonal
-            while r < self.board_size and c < self.board_size:
-                cells.append((r, c))
-                r += 1
-                c += 1
-            return cells
-        elif bomb_type == 'diag2':  # ↙ anti-diagonal through (row, col)
-            cells = []
-            # Go to the top-right of the diagonal
-            r, c = row, col
-            while r > 0 and c < self.board_size - 1:
-                r -= 1
-                c += 1
-            # Collect all cells along the diagonal
-            while r < self.board_size and c >= 0:
-                cells.append((r, c))
-                r += 1
-                c -= 1
-            return cells
-        else:
-            return [(r, col) for r in range(self.board_size)]
+        self.update_cells(bomb_cells)
 
     def make_move(self, row, col, player, skip_switch=False):
         """ביצוע מהלך - הצבת חתיכה ובדיקת ניצחון"""
         symbol = PLAYER_SYMBOLS[player]
         color = X_COLOR if player == 0 else O_COLOR
-        self.board[row][col] = symbol
+        self.state.place(row, col, symbol)
         
-        # ציור הגריד מיד אחרי הצעד
-        self.draw_modern_board()
+        # ציור התא מיד אחרי הצעד
+        self.update_cells([(row, col)])
         
-        win_cells = self.get_win_cells(row, col, symbol)
+        win_cells = self.state.get_win_cells(row, col, symbol)
         if win_cells:
             self.game_over = True
             self.disable_board()
@@ -534,7 +506,7 @@ class GomokuGUI:
             # אפקט ניצחון
             self.show_win_effect(win_cells, player)
             return
-        elif self.is_board_full():
+        elif self.state.is_full():
             self.game_over = True
             self.handle_game_end(winner=None)
             return
@@ -551,42 +523,42 @@ class GomokuGUI:
         """הצגת אפקט ניצחון עם אימוג'י על התאים המנצחים"""
         winner_emoji = "🏆" if player == 0 else "🤖"
         
-        # הצגת האימוג'י על כל התאים המנצחים
-        for r, c in win_cells:
-            if hasattr(self, 'board_offset_x') and hasattr(self, 'cell_size'):
-                x0 = self.board_offset_x + BOARD_PADDING + c * self.cell_size
-                y0 = self.board_offset_y + BOARD_PADDING + r * self.cell_size
-                font_size = max(20, self.cell_size // 2)
-                self.board_canvas.create_text(x0 + self.cell_size//2, y0 + self.cell_size//2, 
-                                           text=winner_emoji, font=("Apple Color Emoji", font_size), 
-                                           fill='#FFD700', tags='win_effect')
-        
-        self.root.update()
-        self.root.after(1500)  # המתנה של 1.5 שניות
-        
-        # מחיקת האפקט
-        self.board_canvas.delete('win_effect')
-        
-        # המשך לסיום המשחק
-        self.handle_game_end(winner=player)
-
-    def get_win_cells(self, row, col, symbol):
-        """בדיקה אם יש רצף מנצח מהתא הנוכחי - מחזיר את התאים המנצחים"""
-        for d_row, d_col in [(0,1),(1,0),(1,1),(1,-1)]:
-            cells = [(row, col)]
-            r, c = row + d_row, col + d_col
-            while 0 <= r < self.board_size and 0 <= c < self.board_size and self.board[r][c] == symbol:
-                cells.append((r, c))
-                r += d_row
-                c += d_col
-            r, c = row - d_row, col - d_col
-            while 0 <= r < self.board_size and 0 <= c < self.board_size and self.board[r][c] == symbol:
-                cells.insert(0, (r, c))
-                r -= d_row
-                c -= d_col
-            if len(cells) >= WIN_LENGTH:
-                return cells[:WIN_LENGTH]
-        return None
+        # הצגת האימוג'י על כל התאים המנצחים למשך 1.5 שניות ואז המשך לסיום המשחק
+        self.play_animation([(win_cells, winner_emoji, '#FFD700', 1500)],
+                            lambda: self.handle_game_end(winner=player))
+
+    def play_animation(self, frames, on_done):
+        """הרצת רצף אפקטים בלי לחסום את לולאת האירועים
+
+        כל פריים הוא (cells, text, fill, ms) - האימוג'י מוצג על התאים למשך ms
+        ואז נמחק. בסוף הרצף on_done נקרא, ועד אז הקלט של השחקן חסום.
+        """
+        self.animating = True
+        self.next_animation_frame(list(frames), on_done)
+
+    def next_animation_frame(self, frames, on_done):
+        """מחיקת הפריים הקודם והצגת הבא דרך root.after - או סיום הרצף"""
+        self._animation_job = None
+        self.board_canvas.delete('animation_effect')
+        if not frames:
+            self.animating = False
+            on_done()
+            return
+        cells, text, fill, ms = frames.pop(0)
+        if hasattr(self, 'cell_size'):
+            font_size = max(20, self.cell_size // 2)
+            for r, c in cells:
+                x0, y0 = self.cell_origin(r, c)
+                self.board_canvas.create_text(x0 + self.cell_size//2, y0 + self.cell_size//2, text=text,
+                                              font=("Apple Color Emoji", font_size), fill=fill, tags='animation_effect')
+        self._animation_job = self.root.after(ms, self.next_animation_frame, frames, on_done)
+
+    def cancel_animation(self):
+        """עצירת אנימציה שרצה - ההמשך שלה לא יקרה (למשל במעבר לסיבוב חדש)"""
+        if self._animation_job is not None:
+            self.root.after_cancel(self._animation_job)
+            self._animation_job = None
+        self.animating = False
 
     def handle_game_end(self, winner):
         """טיפול בסיום משחק - עדכון ניקוד, הצגת הודעה ומעבר לסיבוב הבא"""
@@ -619,197 +591,114 @@ class GomokuGUI:
 
     def ai_move(self):
         """ביצוע מהלך AI - שימוש באסטרטגיות שונות כולל חסימה, פצצה ותור כפול"""
-        if self.game_over:
+        if self.game_over or self.current_player != 1 or self.ai_thinking:
+            return
+
+        # עמדות פתיחה נענות מהספר בלי חיפוש - לוחות קטנים נפתרים במדויק במנוע
+        book_move = self.book.lookup(self.state) if self.board_size > SOLVER_MAX_SIZE else None
+        if book_move is not None:
+            self.ai_play_move(book_move)
             return
             
         if self.blocks_left[1] > 0:
-            dangerous_cell = self.ai_find_dangerous_cell()
+            dangerous_cell = self.engine.find_dangerous_cell(self.state)
             if dangerous_cell:
                 row, col = dangerous_cell
                 self.ai_place_block(row, col)
                 return
                 
         if not self.bomb_used[1]:
-            bomb_target = self.ai_find_bomb_target()
+            bomb_target = self.engine.find_bomb_target(self.state)
             if bomb_target:
                 row, col, bomb_type = bomb_target
                 self.ai_use_bomb(row, col, bomb_type)
                 return
-                
+
+        self.start_ai_search(self.ai_play_move)
+
+    def start_ai_search(self, on_done):
+        """הפעלת חיפוש המהלך ברקע - on_done יקרא עם המהלך כשהחיפוש יסתיים"""
+        self.ai_thinking = True
+        self._ai_on_done = on_done
+        generation = self.worker.submit(self.engine.find_best_move, self.state)
+        self.root.after(AI_POLL_MS, self.poll_ai_search, generation)
+
+    def poll_ai_search(self, generation):
+        """בדיקה מחזורית דרך root.after אם חיפוש הרקע החזיר תוצאה"""
+        if generation != self.worker.generation:
+            return
+        done, best = self.worker.poll()
+        if not done:
+            self.root.after(AI_POLL_MS, self.poll_ai_search, generation)
+            return
+        self.ai_thinking = False
+        self.log_search_stats()
+        self._ai_on_done(best)
+
+    def log_search_stats(self):
+        """הדפסת המעקב של החיפוש האחרון ומוני המנוע - רק כש-AI_DEBUG דלוק
+
+        המונים מצטברים מההדפסה הקודמת, כך שהם כוללים גם את החיפוש על זמן השחקן.
+        """
+        stats = self.engine.stats
+        if stats is None:
+            return
+        print(stats.format_trace())
+        print(stats.summary())
+        stats.reset()
+
+    def start_pondering(self):
+        """הפעלת חיפוש על זמן השחקן - התוצאות נשמרות בטבלה של המנוע לחיפוש הבא"""
+        if not AI_PONDER or self.game_over or self.current_player != 0:
+            return
+        self.worker.submit(self.engine.ponder, self.state)
+
+    def stop_pondering(self):
+        """עצירת החיפוש על זמן השחקן לפני שהלוח משתנה"""
+        if not self.ai_thinking:
+            self.worker.cancel()
+
+    def cancel_ai_search(self):
+        """ביטול חיפוש רקע שרץ - למשל באיפוס או במעבר לסיבוב חדש"""
+        self.worker.cancel()
+        self.ai_thinking = False
+
+    def ai_play_move(self, best):
+        """ביצוע המהלך שהחיפוש מצא - כולל החלטה על תור כפול"""
+        if self.game_over:
+            return
+        if best is None:
+            if self.double_move_active[1]:
+                self.double_move_active[1] = False
+                self.double_move_counter = 0
+                self.current_player = 0
+                self.start_pondering()
+            return
+        row, col = best
         if not self.double_move_used[1]:
-            best = self.find_best_move()
-            if best:
-                row, col = best
-                if self.get_win_cells(row, col, '⚪'):
-                    self.double_move_active[1] = True
-                    self.double_move_used[1] = True
-                    self.double_move_counter = 0
-                    
+            if self.state.get_win_cells(row, col, '⚪'):
+                self.double_move_active[1] = True
+                self.double_move_used[1] = True
+                self.double_move_counter = 0
+
         if self.double_move_active[1]:
-            for _ in range(2):
-                if self.game_over:
-                    return
-                best = self.find_best_move()
-                if best:
-                    row, col = best
-                    self.make_move(row, col, 1, skip_switch=True)
-                    self.double_move_counter += 1
-                else:
-                    break
+            rounds = self.rounds
+            self.make_move(row, col, 1, skip_switch=True)
+            self.double_move_counter += 1
+            # ניצחון מסיים את הסיבוב ועשוי כבר לפתוח סיבוב חדש
+            if self.game_over or self.rounds != rounds:
+                return
+            if self.double_move_counter < 2:
+                self.start_ai_search(self.ai_play_move)
+                return
             self.double_move_active[1] = False
             self.double_move_counter = 0
             self.current_player = 0
+            self.start_pondering()
             return
-            
-        best = self.find_best_move()
-        if best:
-            row, col = best
-            self.make_move(row, col, 1)
-
-    def find_best_move(self):
-        """מציאת המהלך הטוב ביותר עבור AI - אלגוריתם minimax"""
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                if self.board[row][col] is None:
-                    if self.get_win_cells(row, col, '⚪'):
-                        return (row, col)
-        
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                if self.board[row][col] is None:
-                    if self.get_win_cells(row, col, '⚫'):
-                        return (row, col)
-        
-        best_score = float('-inf')
-        best_move = None
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                if self.board[row][col] is None:
-                    new_board = copy.deepcopy(self.board)
-                    new_board[row][col] = '⚪'
-                    score = self.minimax(new_board, AI_DEPTH - 1, False, float('-inf'), float('inf'))
-                    if score > best_score:
-                        best_score = score
-                        best_move = (row, col)
-        return best_move
-
-
-
-    def minimax(self, board, depth, maximizing, alpha, beta):
-        """אלגוריתם minimax עם alpha-beta pruning לחישוב המהלך הטוב ביותר"""
-        winner = self.get_winner(board)
-        if winner in ('O', '⚪'):
-            return 1_000_000
-        elif winner in ('X', '⚫'):
-            return -1_000_000
-        elif self.is_full(board):
-            return 0
-        if depth == 0:
-            return self.evaluate_board(board)
-        if maximizing:
-            max_eval = float('-inf')
-            for row in range(self.board_size):
-                for col in range(self.board_size):
-                    if board[row][col] is None:
-                        board[row][col] = '⚪'
-                        eval = self.minimax(board, depth-1, False, alpha, beta)
-                        board[row][col] = None
-                        max_eval = max(max_eval, eval)
-                        alpha = max(alpha, eval)
-                        if beta <= alpha:
-                            return max_eval
-            return max_eval
-        else:
-            min_eval = float('inf')
-            for row in range(self.board_size):
-                for col in range(self.board_size):
-                    if board[row][col] is None:
-                        board[row][col] = '⚫'
-                        eval = self.minimax(board, depth-1, True, alpha, beta)
-                        board[row][col] = None
-                        min_eval = min(min_eval, eval)
-                        beta = min(beta, eval)
-                        if beta <= alpha:
-                            return min_eval
-            return min_eval
-
-    def evaluate_board(self, board):
-        """הערכת מצב הלוח - חישוב ציון עבור AI"""
-        score = 0
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                if board[row][col] not in (None, BLOCK_SYMBOL):
-                    symbol = board[row][col]
-                    for d_row, d_col in [(0,1),(1,0),(1,1),(1,-1)]:
-                        score += self.evaluate_direction(board, row, col, d_row, d_col, symbol)
-        return score
-
-    def evaluate_direction(self, board, row, col, d_row, d_col, symbol):
-        """הערכת כיוון ספציפי בלוח - חישוב ציון עבור רצף נתון"""
-        prev_r, prev_c = row - d_row, col - d_col
-        if 0 <= prev_r < self.board_size and 0 <= prev_c < self.board_size and board[prev_r][prev_c] == symbol:
-            return 0
-        length = 0
-        r, c = row, col
-        while 0 <= r < self.board_size and 0 <= c < self.board_size and board[r][c] == symbol:
-            length += 1
-            r += d_row
-            c += d_col
-        if length < 2:
-            return 0
-        end_r, end_c = r, c
-        open_ends = 0
-        for check_r, check_c in [(row - d_row, col - d_col), (end_r, end_c)]:
-            if 0 <= check_r < self.board_size and 0 <= check_c < self.board_size and board[check_r][check_c] is None:
-                open_ends += 1
-        if symbol in ('O', '⚪'):
-            base = 10
-        else:
-            base = -10
-        if open_ends == 2:
-            return base ** length
-        elif open_ends == 1:
-            return (base ** length) // 2
-        else:
-            return 0
-
-    def get_winner(self, board):
-        """בדיקה אם יש מנצח בלוח נתון"""
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                symbol = board[row][col]
-                if symbol not in ('X', 'O', '⚫', '⚪'):
-                    continue
-                for d_row, d_col in [(0,1),(1,0),(1,1),(1,-1)]:
-                    if self.count_consecutive_board(board, row, col, d_row, d_col, symbol) >= WIN_LENGTH:
-                        return symbol
-        return None
-
-    def count_consecutive_board(self, board, row, col, d_row, d_col, symbol):
-        """ספירת רצף של חתיכות בכיוון נתון בלוח"""
-        count = 0
-        r, c = row, col
-        while 0 <= r < self.board_size and 0 <= c < self.board_size and board[r][c] == symbol:
-            count += 1
-            r += d_row
-            c += d_col
-        return count
-
-    def is_full(self, board):
-        """בדיקה אם הלוח מלא - תיקו"""
-        for row in board:
-            for cell in row:
-                if cell is None:
-                    return False
-        return True
-
-    def is_board_full(self):
-        """בדיקה אם הלוח הנוכחי מלא"""
-        for row in self.board:
-            for cell in row:
-                if cell is None:
-                    return False
-        return True
+
+        self.make_move(row, col, 1)
+        self.start_pondering()
 
     def disable_board(self):
         """כיבוי הלוח - מניעת משחק נוסף"""
@@ -819,9 +708,12 @@ class GomokuGUI:
         """מעבר למשחק הבא בטורניר - יצירת לוח חדש ועדכון ממשק"""
         if self.rounds >= MAX_ROUNDS:
             return
+        self.cancel_ai_search()
+        self.cancel_animation()
         self.current_player = 0
         self.set_board_size()
-        self.board = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
+        self.state = GameState(self.board_size)
+        self.engine.new_game()
         self.buttons = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
         self.game_over = False
         self.block_mode = False
@@ -842,7 +734,7 @@ class GomokuGUI:
         
         self.draw_modern_board()
         self.board_canvas.bind('<Button-1>', self.handle_canvas_click)
-        self.board_canvas.bind('<Configure>', lambda e: self.draw_modern_board())
+        self.board_canvas.bind('<Configure>', self.on_canvas_resize)
         self.update_option_buttons()
 
     def reset_all(self):
@@ -937,6 +829,33 @@ class GomokuGUI:
         self.board_canvas.delete('all')
         size = self.board_size
         
+        cell_size, w, h, offset_x, offset_y = self.board_geometry()
+        
+        # הפריטים הישנים נמחקו, אז תמונות של גדלים קודמים כבר לא בשימוש
+        self.prune_sprite_cache(cell_size, (w, h))
+        
+        # הרקע, התאים והחיילים מגיעים מהמטמון - ציור מחדש רק יוצר פריטי canvas
+        self.board_canvas.create_image(offset_x, offset_y, anchor='nw', image=self.get_board_sprite(w, h))
+        
+        # Store board position for click handling
+        self.board_offset_x = offset_x
+        self.board_offset_y = offset_y
+        self.cell_size = cell_size
+        
+        cell_img_tk = self.get_cell_sprite(cell_size, 'cell')
+        # Draw grid cells - נוצרים פעם אחת לכל גודל, ומהלכים מעדכנים רק את החיילים
+        for r in range(size):
+            for c in range(size):
+                x0, y0 = self.cell_origin(r, c)
+                self.board_canvas.create_image(x0, y0, anchor='nw', image=cell_img_tk, tags=('cell', f'cell_{r}_{c}'))
+        for r in range(size):
+            for c in range(size):
+                self.draw_piece(r, c)
+
+    def board_geometry(self):
+        """חישוב גודל התא, מידות הלוח והיסט המרכוז לפי גודל ה-canvas הנוכחי"""
+        size = self.board_size
+        
         # Get canvas dimensions
         canvas_w = self.board_canvas.winfo_width()
         canvas_h = self.board_canvas.winfo_height()
@@ -960,17 +879,98 @@ class GomokuGUI:
         offset_x = (canvas_w - w) // 2
         offset_y = (canvas_h - h) // 2
         
-        # Create gradient background for the board container
-        board_img = Image.new('RGBA', (w, h), (0,0,0,0))
-        draw = ImageDraw.Draw(board_img)
+        return cell_size, w, h, offset_x, offset_y
+
+    def on_canvas_resize(self, event):
+        """איחוד אירועי <Configure> - הציור נדחה עד שהגרירה נרגעת, עם תקרת המתנה"""
+        now = time.perf_counter()
+        if self._resize_job is not None:
+            self.root.after_cancel(self._resize_job)
+            if (now - self._resize_started) * 1000 >= RESIZE_MAX_WAIT_MS:
+                self.apply_resize()
+                return
+        else:
+            self._resize_started = now
+        self._resize_job = self.root.after(RESIZE_SETTLE_MS, self.apply_resize)
+
+    def apply_resize(self):
+        """התאמת הלוח לגודל ה-canvas - ציור מחדש רק אם גודל התא השתנה, אחרת הזזה"""
+        self._resize_job = None
+        cell_size, w, h, offset_x, offset_y = self.board_geometry()
+        if getattr(self, 'cell_size', None) != cell_size:
+            self.draw_modern_board()
+            return
+        dx = offset_x - self.board_offset_x
+        dy = offset_y - self.board_offset_y
+        if dx or dy:
+            self.board_canvas.move('all', dx, dy)
+            self.board_offset_x = offset_x
+            self.board_offset_y = offset_y
+
+    def cell_origin(self, row, col):
+        """הפינה השמאלית-עליונה של תא על ה-canvas לפי הציור האחרון"""
+        x0 = self.board_offset_x + BOARD_PADDING + col * self.cell_size
+        y0 = self.board_offset_y + BOARD_PADDING + row * self.cell_size
+        return x0, y0
+
+    def draw_piece(self, row, col):
+        """יצירת הפריט של תא אחד (חייל או חסימה) עם תגית piece_<row>_<col>"""
+        cell_size = self.cell_size
+        x0, y0 = self.cell_origin(row, col)
+        tags = ('piece', f'piece_{row}_{col}')
+        piece_offset = 8  # Leave some margin
         
-        # Create gradient from purple to blue
-        for y in range(h):
-            ratio = y / h
-            r = int(90 * (1 - ratio) + 193 * ratio)  # Purple to blue
-            g = int(95 * (1 - ratio) + 114 * ratio)
-            b = int(239 * (1 - ratio) + 245 * ratio)
-            draw.rectangle([0, y, w-1, y], fill=(r, g, b, 180))
+        # Draw pieces with glossy effect
+        val = self.board[row][col]
+        if val in ('⚫', 'X'):
+            piece_img_tk = self.get_cell_sprite(cell_size, 'black')
+            self.board_canvas.create_image(x0+piece_offset, y0+piece_offset, anchor='nw', image=piece_img_tk, tags=tags)
+        elif val in ('⚪', 'O'):
+            piece_img_tk = self.get_cell_sprite(cell_size, 'white')
+            self.board_canvas.create_image(x0+piece_offset, y0+piece_offset, anchor='nw', image=piece_img_tk, tags=tags)
+        elif val == BLOCK_SYMBOL:
+            # Block symbol with red tint
+            font_size = max(20, cell_size // 2)
+            self.board_canvas.create_text(x0 + cell_size//2, y0 + cell_size//2, 
+                                        text=BLOCK_SYMBOL, font=("Apple Color Emoji", font_size), fill='#D32F2F', tags=tags)
+
+    def update_cells(self, cells):
+        """עדכון הציור רק בתאים שהשתנו - מחיקת הפריט הישן ויצירת החדש לפי הלוח"""
+        if not hasattr(self, 'cell_size'):
+            self.draw_modern_board()
+            return
+        for row, col in cells:
+            self.board_canvas.delete(f'piece_{row}_{col}')
+            self.draw_piece(row, col)
+
+    def prune_sprite_cache(self, cell_size, board_dims):
+        """שחרור תמונות שלא שייכות לגודל הנוכחי - המטמון לא גדל בזמן שינוי גודל החלון"""
+        for key in list(self._sprite_cache):
+            if key[0] not in (cell_size, board_dims):
+                del self._sprite_cache[key]
+
+    def get_board_sprite(self, w, h):
+        """רקע הלוח (גרדיאנט וצל) לגודל נתון - נבנה פעם אחת ונשמר במטמון"""
+        key = ((w, h), 'board')
+        if key not in self._sprite_cache:
+            self._sprite_cache[key] = ImageTk.PhotoImage(self.render_board_image(w, h))
+        return self._sprite_cache[key]
+
+    def get_cell_sprite(self, cell_size, kind):
+        """תמונת תא או חייל ('cell', 'black', 'white') לגודל תא נתון - מהמטמון"""
+        key = (cell_size, kind)
+        if key not in self._sprite_cache:
+            self._sprite_cache[key] = ImageTk.PhotoImage(self.render_cell_image(cell_size, kind))
+        return self._sprite_cache[key]
+
+    def render_board_image(self, w, h):
+        """ציור רקע הלוח ב-PIL - גרדיאנט סגול-כחול מעל צל מטושטש"""
+        # Create gradient from purple to blue - one column, stretched to the full width
+        column = Image.new('RGBA', (1, h))
+        column.putdata([(int(90 * (1 - y / h) + 193 * y / h),
+                         int(95 * (1 - y / h) + 114 * y / h),
+                         int(239 * (1 - y / h) + 245 * y / h), 180) for y in range(h)])
+        board_img = column.resize((w, h), Image.NEAREST)
         
         # Add rounded corners and shadow
         shadow = Image.new('RGBA', (w+20, h+20), (0,0,0,0))
@@ -979,83 +979,37 @@ class GomokuGUI:
         shadow = shadow.filter(ImageFilter.GaussianBlur(8))
         
         # Composite shadow and board
-        board_img_with_shadow = Image.alpha_composite(shadow.crop((0,0,w,h)), board_img)
-        self._board_img_tk = ImageTk.PhotoImage(board_img_with_shadow)
-        self.board_canvas.create_image(offset_x, offset_y, anchor='nw', image=self._board_img_tk)
+        return Image.alpha_composite(shadow.crop((0,0,w,h)), board_img)
+
+    def render_cell_image(self, cell_size, kind):
+        """ציור תא שקוף או חייל מבריק ב-PIL לפי הסוג"""
+        if kind == 'cell':
+            # Create semi-transparent cell with rounded corners
+            cell_img = Image.new('RGBA', (cell_size, cell_size), (0,0,0,0))
+            cell_draw = ImageDraw.Draw(cell_img)
+            cell_draw.rounded_rectangle([0,0,cell_size-1,cell_size-1], radius=18, 
+                                      fill=(255,255,255,25), outline=(255,255,255,50), width=1)
+            return cell_img
+        if kind == 'black':
+            # Blue glossy piece for player 1
+            fill, outline = (115,209,255,200), (59,144,224,255)
+        else:
+            # Orange-pink glossy piece for player 2
+            fill, outline = (255,182,163,200), (247,96,96,255)
+        piece_size = cell_size - 16  # Leave some margin
+        piece_img = Image.new('RGBA', (piece_size, piece_size), (0,0,0,0))
+        piece_draw = ImageDraw.Draw(piece_img)
         
-        # Store board position for click handling
-        self.board_offset_x = offset_x
-        self.board_offset_y = offset_y
-        self.cell_size = cell_size
+        # Main circle
+        piece_draw.ellipse([0,0,piece_size-1,piece_size-1], fill=fill, outline=outline, width=3)
         
-        # Draw grid cells
-        for r in range(size):
-            for c in range(size):
-                x0 = offset_x + BOARD_PADDING + c*cell_size
-                y0 = offset_y + BOARD_PADDING + r*cell_size
-                x1 = x0 + cell_size
-                y1 = y0 + cell_size
-                
-                # Create semi-transparent cell with rounded corners
-                cell_img = Image.new('RGBA', (cell_size, cell_size), (0,0,0,0))
-                cell_draw = ImageDraw.Draw(cell_img)
-                cell_draw.rounded_rectangle([0,0,cell_size-1,cell_size-1], radius=18, 
-                                          fill=(255,255,255,25), outline=(255,255,255,50), width=1)
-                cell_img_tk = ImageTk.PhotoImage(cell_img)
-                self.board_canvas.create_image(x0, y0, anchor='nw', image=cell_img_tk)
-                if not hasattr(self, '_cell_imgs_tk'):
-                    self._cell_imgs_tk = []
-                self._cell_imgs_tk.append(cell_img_tk)
-                
-                # Draw pieces with glossy effect
-                val = self.board[r][c]
-                if val in ('⚫', 'X'):
-                    # Blue glossy piece for player 1
-                    piece_size = cell_size - 16  # Leave some margin
-                    piece_img = Image.new('RGBA', (piece_size, piece_size), (0,0,0,0))
-                    piece_draw = ImageDraw.Draw(piece_img)
-                    
-                    # Main blue circle
-                    piece_draw.ellipse([0,0,piece_size-1,piece_size-1], fill=(115,209,255,200), outline=(59,144,224,255), width=3)
-                    
-                    # Shine effect (white highlight)
-                    shine_size = piece_size // 3
-                    piece_draw.ellipse([2,2,shine_size,shine_size], fill=(255,255,255,120))
-                    
-                    # Shadow effect
-                    piece_draw.ellipse([3,3,piece_size-1,piece_size-1], fill=(59,144,224,80))
-                    
-                    piece_img_tk = ImageTk.PhotoImage(piece_img)
-                    piece_offset = (cell_size - piece_size) // 2
-                    self.board_canvas.create_image(x0+piece_offset, y0+piece_offset, anchor='nw', image=piece_img_tk)
-                    self._cell_imgs_tk.append(piece_img_tk)
-                    
-                elif val in ('⚪', 'O'):
-                    # Orange-pink glossy piece for player 2
-                    piece_size = cell_size - 16  # Leave some margin
-                    piece_img = Image.new('RGBA', (piece_size, piece_size), (0,0,0,0))
-                    piece_draw = ImageDraw.Draw(piece_img)
-                    
-                    # Main orange-pink circle
-                    piece_draw.ellipse([0,0,piece_size-1,piece_size-1], fill=(255,182,163,200), outline=(247,96,96,255), width=3)
-                    
-                    # Shine effect (white highlight)
-                    shine_size = piece_size // 3
-                    piece_draw.ellipse([2,2,shine_size,shine_size], fill=(255,255,255,120))
-                    
-                    # Shadow effect
-                    piece_draw.ellipse([3,3,piece_size-1,piece_size-1], fill=(247,96,96,80))
-                    
-                    piece_img_tk = ImageTk.PhotoImage(piece_img)
-                    piece_offset = (cell_size - piece_size) // 2
-                    self.board_canvas.create_image(x0+piece_offset, y0+piece_offset, anchor='nw', image=piece_img_tk)
-                    self._cell_imgs_tk.append(piece_img_tk)
-                    
-                elif val == BLOCK_SYMBOL:
-                    # Block symbol with red tint
-                    font_size = max(20, cell_size // 2)
-                    self.board_canvas.create_text(x0 + cell_size//2, y0 + cell_size//2, 
-                                                text=BLOCK_SYMBOL, font=("Apple Color Emoji", font_size), fill='#D32F2F')
+        # Shine effect (white highlight)
+        shine_size = piece_size // 3
+        piece_draw.ellipse([2,2,shine_size,shine_size], fill=(255,255,255,120))
+        
+        # Shadow effect
+        piece_draw.ellipse([3,3,piece_size-1,piece_size-1], fill=outline[:3] + (80,))
+        return piece_img
 
     def handle_canvas_click(self, event):
         """טיפול בלחיצה על canvas הלוח - המרת קואורדינטות וטיפול במהלך"""
@@ -1090,99 +1044,37 @@ class GomokuGUI:
         """AI משתמש בפצצה - בחירת מיקום וסוג פצצה אופטימלי"""
         if self.bomb_used[1]:
             return
-        bomb_cells = self.get_bombed_cells(row, col, bomb_type)
-        
-        # Show bomb emoji first
-        for r, c in bomb_cells:
-            if hasattr(self, 'board_offset_x') and hasattr(self, 'cell_size'):
-                x0 = self.board_offset_x + BOARD_PADDING + c * self.cell_size
-                y0 = self.board_offset_y + BOARD_PADDING + r * self.cell_size
-                font_size = max(20, self.cell_size // 2)
-                self.board_canvas.create_text(x0 + self.cell_size//2, y0 + self.cell_size//2, text='💣', font=("Apple Color Emoji", font_size), fill='black', tags='ai_bomb_effect')
-        self.root.update()
-        self.root.after(350)
-        self.board_canvas.delete('ai_bomb_effect')
-        
-        # Show explosion emoji
-        for r, c in bomb_cells:
-            if hasattr(self, 'board_offset_x') and hasattr(self, 'cell_size'):
-                x0 = self.board_offset_x + BOARD_PADDING + c * self.cell_size
-                y0 = self.board_offset_y + BOARD_PADDING + r * self.cell_size
-                font_size = max(20, self.cell_size // 2)
-                self.board_canvas.create_text(x0 + self.cell_size//2, y0 + self.cell_size//2, text='💥', font=("Apple Color Emoji", font_size), fill='red', tags='ai_explosion_effect')
-        self.root.update()
-        self.root.after(350)
-        self.board_canvas.delete('ai_explosion_effect')
+        bomb_cells = self.state.get_bombed_cells(row, col, bomb_type)
         
-        for r, c in bomb_cells:
-            self.board[r][c] = None
+        # Show bomb emoji first, then explosion
+        self.play_animation([(bomb_cells, '💣', 'black', 350), (bomb_cells, '💥', 'red', 350)],
+                            lambda: self.finish_ai_bomb(bomb_cells))
+
+    def finish_ai_bomb(self, bomb_cells):
+        """המשך הפצצה של ה-AI אחרי האנימציה - ניקוי התאים והחזרת התור לשחקן"""
+        self.state.clear_cells(bomb_cells)
         self.bomb_used[1] = True
         self.last_action[1] = 'bomb'
         self.current_player = 0
         self.update_avatar_highlight()
-        self.draw_modern_board()
+        self.update_cells(bomb_cells)
+        self.start_pondering()
 
     def ai_place_block(self, row, col):
         """AI מחסום תא - בחירת מיקום חסימה אסטרטגי"""
         if self.board[row][col] is not None or self.blocks_left[1] <= 0:
             return
-        if hasattr(self, 'board_offset_x') and hasattr(self, 'cell_size'):
-            x0 = self.board_offset_x + BOARD_PADDING + col * self.cell_size
-            y0 = self.board_offset_y + BOARD_PADDING + row * self.cell_size
-            font_size = max(20, self.cell_size // 2)
-            self.board_canvas.create_text(x0 + self.cell_size//2, y0 + self.cell_size//2, text='🚫', font=("Apple Color Emoji", font_size), fill='#D32F2F', tags='ai_block_effect')
-        self.root.update()
-        self.root.after(200)
-        self.board_canvas.delete('ai_block_effect')
-        self.board[row][col] = BLOCK_SYMBOL
+        self.play_animation([([(row, col)], '🚫', '#D32F2F', 200)], lambda: self.finish_ai_block(row, col))
+
+    def finish_ai_block(self, row, col):
+        """הצבת החסימה של ה-AI אחרי האנימציה והחזרת התור לשחקן"""
+        self.state.place(row, col, BLOCK_SYMBOL)
         self.blocks_left[1] -= 1
         self.last_action[1] = 'move'
         self.current_player = 0
         self.update_avatar_highlight()
-        self.draw_modern_board()
-
-    def ai_find_dangerous_cell(self):
-        """מציאת תא מסוכן לחסימה - AI מחפש רצפים של 4+ חתיכות"""
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                if self.board[row][col] is not None:
-                    continue
-                for d_row, d_col in [(0,1), (1,0), (1,1), (1,-1)]:
-                    count = 0
-                    r, c = row + d_row, col + d_col
-                    while 0 <= r < self.board_size and 0 <= c < self.board_size and self.board[r][c] in ('X', '⚫'):
-                        count += 1
-                        r += d_row
-                        c += d_col
-                    r, c = row - d_row, col - d_col
-                    while 0 <= r < self.board_size and 0 <= c < self.board_size and self.board[r][c] in ('X', '⚫'):
-                        count += 1
-                        r -= d_row
-                        c -= d_col
-                    if count >= 4:
-                        return (row, col)
-        return None
-
-    def ai_find_bomb_target(self):
-        """מציאת יעד לפצצה - AI מחפש אזורים צפופים לניקוי"""
-        best_target = None
-        max_score = 0
-
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                for bomb_type in ['col', 'row', 'diag1', 'diag2']:
-                    bomb_cells = self.get_bombed_cells(row, col, bomb_type)
-                    score = 0
-                    for r, c in bomb_cells:
-                        if self.board[r][c] in ('X', '⚫'):
-                            score += 2
-                        elif self.board[r][c] in ('O', '⚪'):
-                            score -= 1
-                    if score > max_score and score >= 6:
-                        max_score = score
-                        best_target = (row, col, bomb_type)
-
-        return best_target
+        self.update_cells([(row, col)])
+        self.start_pondering()
 
 
 def main():
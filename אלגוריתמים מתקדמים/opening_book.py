@@ -0,0 +1,143 @@
+"""ספר פתיחות - תשובות ה-AI לעמדות הפתיחה, מחושבות מראש בחיפוש עמוק
+
+כל עמדה נשמרת פעם אחת לפי המפתח הקנוני שלה (symmetry.canonical_hash) -
+אותו מפתח שטבלת הטרנספוזיציה משתמשת בו בפתיחה. כך רשומה אחת מכסה את כל
+העמדות השקולות, והמהלך נשמר במערכת הצירים הקנונית ומוחזר ללוח האמיתי
+בסימטריה ההפוכה.
+
+פורמט הקובץ: כותרת BOOK_HEADER (magic, גרסה, ZOBRIST_SEED, מספר רשומות)
+ואחריה רשומות BOOK_RECORD של (גודל לוח, מפתח קנוני, מהלך כ-row * size + col).
+המפתחות תלויים ב-ZOBRIST_SEED - שינוי שלו מבטל ספר קיים. התשובות תלויות
+בפונקציית ההערכה ובסדר המהלכים - אחרי שינוי שלהם יש לבנות את הספר מחדש.
+
+בניית הספר מחדש:
+    python opening_book.py --sizes 8 10 --plies 2 --depth 4
+"""
+import argparse
+import os
+import struct
+import time
+
+from engine import GameState, GomokuEngine, PLAYER_SYMBOLS, ZOBRIST_SEED
+from symmetry import symmetries, canonical_hash, INVERSE
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+BOOK_MAGIC = b'GMKB'
+BOOK_VERSION = 1
+BOOK_HEADER = struct.Struct('<4sHQI')
+BOOK_RECORD = struct.Struct('<BQH')
+BOOK_MAX_STONES = 8  # עמדות עם יותר תאים תפוסים לא נמצאות בספר - אין טעם לחשב מפתח
+BOOK_PLIES = 2  # מספר מהלכי ה-AI שהמחולל מכסה מתחילת המשחק
+BOOK_DEPTH = 4  # עומק החיפוש של המחולל לכל עמדה
+
+
+class OpeningBook:
+    """טבלת הפתיחות בזיכרון - (גודל, מפתח קנוני) -> מהלך במערכת הקנונית"""
+
+    def __init__(self, entries=None):
+        """ספר ריק או ספר מרשומות קיימות"""
+        self.entries = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, path=BOOK_PATH):
+        """טעינת ספר מקובץ - קובץ חסר או לא תואם מחזיר ספר ריק"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < BOOK_HEADER.size:
+            print(f"Warning: opening book {path} is truncated")
+            return cls()
+        magic, version, seed, count = BOOK_HEADER.unpack_from(data)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION or seed != ZOBRIST_SEED:
+            print(f"Warning: opening book {path} does not match this engine version")
+            return cls()
+        entries = {}
+        for size, key, move in BOOK_RECORD.iter_unpack(data[BOOK_HEADER.size:BOOK_HEADER.size + count * BOOK_RECORD.size]):
+            entries[(size, key)] = move
+        return cls(entries)
+
+    def save(self, path=BOOK_PATH):
+        """כתיבת הספר לקובץ - רשומות ממוינות כדי שהקובץ יהיה יציב בין בניות"""
+        with open(path, 'wb') as f:
+            f.write(BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, ZOBRIST_SEED, len(self.entries)))
+            for (size, key), move in sorted(self.entries.items()):
+                f.write(BOOK_RECORD.pack(size, key, move))
+
+    def add(self, state, move):
+        """הוספת תשובה (row, col) לעמדה - נשמרת במערכת הצירים הקנונית"""
+        size = state.board_size
+        key, t = canonical_hash(state.bitboard)
+        r, c = symmetries(size)[t](*move)
+        self.entries[(size, key)] = r * size + c
+
+    def lookup(self, state):
+        """תשובת הספר לעמדה כ-(row, col), או None אם העמדה לא בספר"""
+        bb = state.bitboard
+        if (bb.stones[0] | bb.stones[1] | bb.blocks).bit_count() > BOOK_MAX_STONES:
+            return None
+        size = state.board_size
+        key, t = canonical_hash(bb)
+        move = self.entries.get((size, key))
+        if move is None:
+            return None
+        row, col = symmetries(size)[INVERSE[t]](*divmod(move, size))
+        # התנגשות hash נדירה יכולה להצביע על תא תפוס
+        if state.board[row][col] is not None:
+            return None
+        return row, col
+
+    def __len__(self):
+        """מספר העמדות בספר"""
+        return len(self.entries)
+
+
+def generate(sizes, plies=BOOK_PLIES, depth=BOOK_DEPTH, book=None):
+    """בניית ספר - כל מהלך אפשרי של השחור ותשובת חיפוש לעומק depth ללבן
+
+    המחולל מתקדם לסירוגין: כל תשובה של השחור (עד סימטריה) ואחריה תשובת
+    ה-AI בלבד, למשך plies מהלכים של ה-AI.
+    """
+    book = book if book is not None else OpeningBook()
+    for size in sizes:
+        engine = GomokuEngine()
+        start = time.perf_counter()
+        frontier = [GameState(size)]
+        for ply in range(plies):
+            next_frontier = []
+            for state in frontier:
+                bb = state.bitboard
+                replies = [bb.cell(idx) for idx in bb.candidate_cells()] if ply else \
+                    [(r, c) for r in range(size) for c in range(size)]
+                for row, col in replies:
+                    child = state.with_move(row, col, PLAYER_SYMBOLS[0])
+                    if (size, canonical_hash(child.bitboard)[0]) in book.entries:
+                        continue
+                    if child.get_win_cells(row, col, PLAYER_SYMBOLS[0]):
+                        continue
+                    move = engine.search_fixed_depth(child, depth)
+                    if move is None:
+                        continue
+                    book.add(child, move)
+                    next_frontier.append(child.with_move(move[0], move[1], PLAYER_SYMBOLS[1]))
+            frontier = next_frontier
+        print(f"{size}x{size}: {sum(1 for s, _ in book.entries if s == size)} positions "
+              f"in {time.perf_counter() - start:.1f}s")
+    return book
+
+
+def main():
+    """בניית ספר הפתיחות מהשורה ושמירתו לקובץ"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[8, 10])
+    parser.add_argument('--plies', type=int, default=BOOK_PLIES)
+    parser.add_argument('--depth', type=int, default=BOOK_DEPTH)
+    parser.add_argument('--output', default=BOOK_PATH)
+    args = parser.parse_args()
+    book = generate(args.sizes, args.plies, args.depth)
+    book.save(args.output)
+    print(f"Saved {len(book)} positions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""חיפוש מקבילי בשורש - כל מהלך שורש נבדק בתהליך נפרד על כל ליבות המעבד
+
+כל מהלך מקבל ציון מדויק (חלון מלא), ולכן הבחירה - המהלך הראשון עם הציון
+הגבוה ביותר - זהה לזו של החיפוש הסדרתי באותו עומק.
+
+הרצה ישירה משווה בין החיפוש הסדרתי למקבילי באותו עומק:
+    python parallel_search.py --workers 8 --depth 4
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from engine import GameState, GomokuEngine, BitBoard, SearchTimeout, AI_MAX_DEPTH
+
+# מנוע לכל תהליך עובד - טבלת הטרנספוזיציה שלו נשמרת בין משימות
+_worker_engine = None
+
+
+def _score_move(board, idx, depth, deadline):
+    """משימה בתהליך עובד - ציון מדויק של מהלך שורש אחד, או None אם הזמן נגמר
+
+    deadline הוא זמן שעון קיר (time.time) כי perf_counter לא משותף בין תהליכים.
+    """
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = GomokuEngine()
+    engine = _worker_engine
+    bb = BitBoard.from_grid(board)
+    engine.killers = [[None, None] for _ in range(AI_MAX_DEPTH + 1)]
+    engine.deadline = None if deadline is None else time.perf_counter() + (deadline - time.time())
+    bb.place(idx, 1)
+    try:
+        return engine.minimax(bb, depth - 1, False, float('-inf'), float('inf'), idx, 1)
+    except SearchTimeout:
+        return None
+    finally:
+        engine.deadline = None
+
+
+class ParallelSearcher:
+    """מפזר את מהלכי השורש של איטרציה בין תהליכים במאגר קבוע"""
+
+    def __init__(self, workers):
+        """יצירת מחפש עם מספר תהליכים נתון - המאגר נוצר רק בשימוש הראשון"""
+        self.workers = workers
+        self.pool = None
+
+    def search_root(self, engine, board, moves, depth, deadline=None):
+        """ציון כל מהלכי השורש במקביל - מחזיר (מהלך, ציון) כמו GomokuEngine.search_root
+
+        זורק SearchTimeout אם מהלך כלשהו לא הושלם בזמן או שהחיפוש בוטל.
+        """
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = {self.pool.submit(_score_move, board, idx, depth, deadline): idx for idx in moves}
+        scores = {}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            for future in done:
+                score = future.result()
+                if score is None:
+                    pending = self._abandon(pending)
+                    raise SearchTimeout()
+                scores[futures[future]] = score
+            if engine.stop_requested:
+                self._abandon(pending)
+                raise SearchTimeout()
+        best_score = float('-inf')
+        best_move = None
+        for idx in moves:
+            if scores[idx] > best_score:
+                best_score = scores[idx]
+                best_move = idx
+        return best_move, best_score
+
+    def _abandon(self, pending):
+        """ביטול משימות שעוד לא התחילו - משימות שרצות נעצרות בעצמן ב-deadline"""
+        for future in pending:
+            future.cancel()
+        return set()
+
+    def close(self):
+        """סגירת מאגר התהליכים"""
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+
+def _sample_state(size):
+    """עמדת בדיקה קבועה - כמה חתיכות סביב המרכז"""
+    state = GameState(size)
+    c = size // 2
+    for row, col, symbol in [(c, c, '⚫'), (c, c + 1, '⚪'), (c + 1, c, '⚫'),
+                             (c - 1, c + 1, '⚪'), (c + 1, c + 1, '⚫')]:
+        if row < size and col < size:
+            state.place(row, col, symbol)
+    return state
+
+
+def main():
+    """השוואת זמן ומהלך בין חיפוש סדרתי למקבילי באותו עומק על 5x5, 8x8 ו-10x10"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--depth', type=int, default=4)
+    args = parser.parse_args()
+    searcher = ParallelSearcher(args.workers)
+    # חימום המאגר כדי שזמן יצירת התהליכים לא ייספר
+    searcher.search_root(GomokuEngine(), _sample_state(5).board, [0], 1)
+    for size in (5, 8, 10):
+        state = _sample_state(size)
+        serial = GomokuEngine(workers=1)
+        parallel = GomokuEngine(workers=args.workers)
+        parallel.parallel = searcher
+        start = time.perf_counter()
+        serial_move = serial.search_fixed_depth(state, args.depth)
+        serial_time = time.perf_counter() - start
+        start = time.perf_counter()
+        parallel_move = parallel.search_fixed_depth(state, args.depth)
+        parallel_time = time.perf_counter() - start
+        print(f"{size}x{size} depth {args.depth}: serial {serial_time:.2f}s {serial_move}, "
+              f"{args.workers} workers {parallel_time:.2f}s {parallel_move}, "
+              f"speedup x{serial_time / parallel_time:.2f}")
+    searcher.close()
+
+
+if __name__ == "__main__":
+    main()
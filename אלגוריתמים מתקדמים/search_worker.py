@@ -0,0 +1,56 @@
+"""הרצת חיפוש ה-AI בתהליכון רקע - התוצאה חוזרת לממשק דרך תור"""
+import queue
+import threading
+import traceback
+
+
+class SearchWorker:
+    """מריץ משימת חיפוש של המנוע בתהליכון נפרד כדי שחלון ה-Tk לא ייתקע
+
+    כל משימה מקבלת מספר דור. ביטול מעלה את הדור ועוצר את המנוע, כך שתוצאה
+    של חיפוש ישן שמגיעה מאוחר נזרקת ב-poll במקום להגיע למשחק חדש.
+    """
+
+    def __init__(self, engine):
+        """יצירת עובד עבור מנוע נתון"""
+        self.engine = engine
+        self.results = queue.Queue()
+        self.generation = 0
+        self.thread = None
+
+    def submit(self, task, *args):
+        """הפעלת task(*args) ברקע - מבטל קודם חיפוש שעדיין רץ ומחזיר את מספר הדור"""
+        if self.thread is not None and self.thread.is_alive():
+            self.cancel()
+        self.generation += 1
+        self.thread = threading.Thread(target=self._run, args=(self.generation, task, args), daemon=True)
+        self.thread.start()
+        return self.generation
+
+    def _run(self, generation, task, args):
+        """גוף התהליכון - מריץ את המשימה ומכניס את התוצאה לתור"""
+        try:
+            result = task(*args)
+        except Exception:
+            traceback.print_exc()
+            result = None
+        self.results.put((generation, result))
+
+    def poll(self):
+        """בדיקה ללא חסימה אם הגיעה תוצאה לדור הנוכחי - מחזיר (done, result)"""
+        while True:
+            try:
+                generation, result = self.results.get_nowait()
+            except queue.Empty:
+                return False, None
+            if generation == self.generation:
+                return True, result
+
+    def cancel(self):
+        """ביטול החיפוש הנוכחי - המנוע נעצר והתוצאה שלו תיזרק"""
+        self.generation += 1
+        if self.thread is not None and self.thread.is_alive():
+            self.engine.stop_requested = True
+            self.thread.join()
+        self.engine.stop_requested = False
+        self.thread = None
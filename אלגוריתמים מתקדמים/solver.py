@@ -0,0 +1,355 @@
+"""פותר מדויק ללוחות קטנים - חיפוש עד סוף המשחק שמחזיר ניצחון, תיקו או הפסד
+
+על 5x5 עם WIN_LENGTH = 5 יש רק 12 חלונות ניצחון, ולכן אפשר לפתור כל עמדה
+עד הסוף. החיפוש הוא negamax עם alpha-beta על שלושה ערכים וזיכרון של
+עמדות (קנוני תחת 8 הסימטריות כשיש מעט חתיכות), ושני גיזומים:
+- ארבע של היריב חייבת להיחסם, ושתי ארבעות עם תאים שונים הן הפסד.
+- ניצחון דורש מהלך שיוצר שתי ארבעות בבת אחת, כלומר שני חלונות חיים
+  שנחתכים בתא ריק. צד בלי חיתוך כזה לא יכול לנצח, ואם לשני הצדדים אין -
+  העמדה תיקו כבר עכשיו.
+
+החוקים: חתיכות וחסימות שכבר על הלוח. חסימות עתידיות, פצצות ותור כפול לא
+נכללים בעץ - אחרי פעולה כזו העמדה החדשה פשוט נפתרת מחדש.
+
+הטבלה השמורה מכסה את עמדות הפתיחה שבהן ה-AI (הלבן) לפני מהלך, עד
+SOLVER_TABLE_STONES תאים תפוסים, לפי המפתח הקנוני של symmetry. עמדות
+מאוחרות יותר נפתרות בזמן המשחק בתוך SOLVER_MAX_NODES צמתים ו-SOLVER_TIME_SHARE
+מתקציב המהלך של המנוע - כשהפתרון לא מסתיים, שאר הזמן עובר לחיפוש הרגיל.
+
+    python solver.py --build       # בניית הטבלה
+    python solver.py --validate    # השוואת החיפוש ההיוריסטי לתוצאות המדויקות
+"""
+import argparse
+import os
+import struct
+import time
+
+from engine import GameState, GomokuEngine, SearchTimeout, PLAYER_SYMBOLS, WIN_LENGTH, ZOBRIST_SEED
+from symmetry import symmetries, canonical_hash, cell_maps, INVERSE
+
+WIN, DRAW, LOSS = 1, 0, -1
+SOLVER_MAX_SIZE = 5  # לוחות עד גודל זה נפתרים במדויק
+SOLVER_TABLE_STONES = 5  # הטבלה השמורה מכסה עמדות עד מספר תאים תפוסים זה
+SOLVER_MAX_NODES = 300_000  # תקציב הצמתים של פתרון בזמן המשחק - מעבר לו חוזרים לחיפוש הרגיל
+SOLVER_SYMMETRY_STONES = 8  # עד מספר תאים תפוסים זה מפתח הזיכרון קנוני
+SOLVER_MEMO_LIMIT = 3_000_000  # מעבר לזה הזיכרון מתרוקן בין פתרונות
+SOLVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'solver_table.bin')
+TABLE_MAGIC = b'GMKS'
+TABLE_VERSION = 1
+TABLE_HEADER = struct.Struct('<4sHQI')
+TABLE_RECORD = struct.Struct('<BQbH')
+
+_table = None
+
+
+def load_table(path=SOLVER_PATH):
+    """טעינת הטבלה - (גודל, מפתח קנוני) -> (ערך, מהלך במערכת הקנונית)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < TABLE_HEADER.size:
+        print(f"Warning: solver table {path} is truncated")
+        return {}
+    magic, version, seed, count = TABLE_HEADER.unpack_from(data)
+    if magic != TABLE_MAGIC or version != TABLE_VERSION or seed != ZOBRIST_SEED:
+        print(f"Warning: solver table {path} does not match this engine version")
+        return {}
+    entries = {}
+    for size, key, value, move in TABLE_RECORD.iter_unpack(data[TABLE_HEADER.size:TABLE_HEADER.size + count * TABLE_RECORD.size]):
+        entries[(size, key)] = (value, move)
+    return entries
+
+
+def save_table(entries, path=SOLVER_PATH):
+    """כתיבת הטבלה לקובץ - רשומות ממוינות"""
+    with open(path, 'wb') as f:
+        f.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, ZOBRIST_SEED, len(entries)))
+        for (size, key), (value, move) in sorted(entries.items()):
+            f.write(TABLE_RECORD.pack(size, key, value, move))
+
+
+def shared_table():
+    """הטבלה מהקובץ - נטענת פעם אחת לכל תהליך"""
+    global _table
+    if _table is None:
+        _table = load_table()
+    return _table
+
+
+class ExactSolver:
+    """פותר negamax מלא לגודל לוח אחד - הזיכרון נשמר בין קריאות באותו משחק"""
+
+    def __init__(self, state_or_size, max_nodes=SOLVER_MAX_NODES):
+        """יצירת פותר לגודל לוח - max_nodes=None פותר ללא הגבלה"""
+        bb = GameState(state_or_size).bitboard if isinstance(state_or_size, int) else state_or_size.bitboard
+        self.size = bb.board_size
+        self.windows = sorted({window for windows in bb.win_windows for window in windows})
+        self.full_mask = bb.full_mask
+        self.maps = cell_maps(bb)
+        self.max_nodes = max_nodes
+        self.memo = {}
+        # מצטבר לאורך כל הפתרונות, כמו engine.nodes - התקציב נמדד מתחילת כל best_move
+        self.nodes = 0
+        self.node_limit = None
+        # נקבע מבחוץ (למשל מהמנוע) כדי לעצור פתרון שרץ ברקע
+        self.stop_requested = lambda: False
+
+    def key(self, me, opp, blocks):
+        """מפתח הזיכרון - קנוני תחת הסימטריות כשיש מעט חתיכות"""
+        if (me | opp | blocks).bit_count() > SOLVER_SYMMETRY_STONES:
+            return me, opp, blocks
+        best = None
+        for mapping in self.maps:
+            mapped = []
+            for mask in (me, opp, blocks):
+                out = 0
+                while mask:
+                    low = mask & -mask
+                    out |= 1 << mapping[low.bit_length() - 1]
+                    mask ^= low
+                mapped.append(out)
+            mapped = tuple(mapped)
+            if best is None or mapped < best:
+                best = mapped
+        return best
+
+    def expand(self, me, opp, blocks):
+        """ניתוח צומת - (lo, hi, moves): גבולות הערך לצד שתורו ומהלכים כביטים
+
+        ארבע שלי היא ניצחון מיידי. שתי ארבעות של היריב הן הפסד, ואחת מחייבת
+        חסימה. אחרת נבדקים רק תאים בחלונות חיים, קודם תאי החיתוך.
+        """
+        empty = self.full_mask & ~(me | opp | blocks)
+        my_dead = opp | blocks
+        opp_dead = me | blocks
+        my_live = my_cross = opp_live = opp_cross = 0
+        threats = set()
+        for window in self.windows:
+            if not window & my_dead:
+                gap = window & empty
+                if (window & me).bit_count() == WIN_LENGTH - 1:
+                    return WIN, WIN, [gap]
+                my_cross |= my_live & gap
+                my_live |= gap
+            if not window & opp_dead:
+                gap = window & empty
+                if (window & opp).bit_count() == WIN_LENGTH - 1:
+                    threats.add(gap)
+                opp_cross |= opp_live & gap
+                opp_live |= gap
+        if len(threats) >= 2:
+            return LOSS, LOSS, [threats.pop()]
+        lo = LOSS if opp_cross else DRAW
+        hi = WIN if my_cross else DRAW
+        if threats:
+            return lo, hi, [threats.pop()]
+        cross = my_cross | opp_cross
+        first = []
+        rest = []
+        mask = my_live | opp_live
+        while mask:
+            low = mask & -mask
+            (first if low & cross else rest).append(low)
+            mask ^= low
+        return lo, hi, first + rest
+
+    def solve(self, me, opp, blocks, alpha=LOSS, beta=WIN):
+        """ערך העמדה לצד שתורו (me) - WIN, DRAW או LOSS, בתוך חלון alpha-beta"""
+        self.nodes += 1
+        if not self.nodes & 1023:
+            if self.node_limit is not None and self.nodes > self.node_limit:
+                raise SearchTimeout()
+            if self.stop_requested():
+                raise SearchTimeout()
+        key = self.key(me, opp, blocks)
+        entry = self.memo.get(key)
+        if entry is not None:
+            value, low, high = entry
+            if low == high or value >= beta and low == value or value <= alpha and high == value:
+                return value
+        lo, hi, moves = self.expand(me, opp, blocks)
+        if lo == hi or lo >= beta or hi <= alpha:
+            return lo if lo >= beta or lo == hi else hi
+        alpha_orig = alpha
+        best = LOSS - 1
+        for move in moves:
+            value = -self.solve(opp, me | move, blocks, -beta, -alpha)
+            if value > best:
+                best = value
+            if value > alpha:
+                alpha = value
+            if alpha >= beta or best >= hi:
+                break
+        # הרשומה שומרת (ערך, גבול תחתון, גבול עליון) - ערך מחוץ לחלון הוא רק גבול
+        if best <= alpha_orig:
+            self.memo[key] = (best, LOSS, best)
+        elif best >= beta:
+            self.memo[key] = (best, best, WIN)
+        else:
+            self.memo[key] = (best, best, best)
+        return best
+
+    def best_move(self, bb, side, order=None):
+        """המהלך הטוב ביותר לצד נתון - (ביט, ערך) או None אם אין מהלך לבדוק
+
+        order הוא רשימת ביטים בסדר עדיפות (למשל מהמנוע), כך שבין מהלכים עם
+        אותו ערך נבחר זה שהחיפוש ההיוריסטי מעדיף.
+        """
+        me, opp, blocks = bb.stones[side], bb.stones[1 - side], bb.blocks
+        if len(self.memo) > SOLVER_MEMO_LIMIT:
+            self.memo.clear()
+        self.node_limit = None if self.max_nodes is None else self.nodes + self.max_nodes
+        lo, hi, moves = self.expand(me, opp, blocks)
+        if not moves:
+            return None
+        if order:
+            rank = {1 << idx: i for i, idx in enumerate(order)}
+            moves.sort(key=lambda move: rank.get(move, len(rank)))
+        # ערך ידוע בלי חיפוש - ניצחון מיידי, הפסד כפוי או תיקו שכל מהלך משיג
+        if lo == hi:
+            return moves[0].bit_length() - 1, lo
+        best = None
+        best_value = LOSS - 1
+        alpha = LOSS
+        for move in moves:
+            value = -self.solve(opp, me | move, blocks, -WIN, -alpha)
+            if value > best_value:
+                best, best_value = move, value
+            alpha = max(alpha, value)
+            if best_value >= hi:
+                break
+        return best.bit_length() - 1, best_value
+
+    def choose(self, state, side=1, order=None):
+        """מהלך מדויק למצב משחק - מהטבלה השמורה אם יש, אחרת פתרון בתקציב הצמתים
+
+        מחזיר (row, col) או None כשאין מה לפתור או שהתקציב נגמר.
+        """
+        bb = state.bitboard
+        if side == 1 and (bb.stones[0] | bb.stones[1] | bb.blocks).bit_count() <= SOLVER_TABLE_STONES:
+            key, t = canonical_hash(bb)
+            entry = shared_table().get((self.size, key))
+            if entry is not None:
+                row, col = symmetries(self.size)[INVERSE[t]](*divmod(entry[1], self.size))
+                if state.board[row][col] is None:
+                    return row, col
+        try:
+            result = self.best_move(bb, side, order)
+        except SearchTimeout:
+            return None
+        if result is None:
+            return None
+        return bb.cell(result[0])
+
+
+def table_positions(size, reply, stones=SOLVER_TABLE_STONES):
+    """עמדות הטבלה - כל מהלך אפשרי של השחור (עד סימטריה) ותשובת reply של הלבן
+
+    reply(bb) מחזיר (ערך, (row, col)) או None. מחזיר רשימת (מצב, ערך, מהלך)
+    עבור עמדות שבהן הלבן לפני מהלך.
+    """
+    seen = set()
+    positions = []
+    frontier = [GameState(size)]
+    while frontier:
+        next_frontier = []
+        for state in frontier:
+            for row in range(size):
+                for col in range(size):
+                    if state.board[row][col] is not None:
+                        continue
+                    child = state.with_move(row, col, PLAYER_SYMBOLS[0])
+                    key = canonical_hash(child.bitboard)[0]
+                    if key in seen or child.get_win_cells(row, col, PLAYER_SYMBOLS[0]):
+                        continue
+                    seen.add(key)
+                    result = reply(child)
+                    if result is None:
+                        continue
+                    value, move = result
+                    positions.append((child, value, move))
+                    bb = child.bitboard
+                    if (bb.stones[0] | bb.stones[1] | bb.blocks).bit_count() + 2 <= stones:
+                        next_frontier.append(child.with_move(move[0], move[1], PLAYER_SYMBOLS[1]))
+        frontier = next_frontier
+    return positions
+
+
+def build(sizes=(SOLVER_MAX_SIZE,), path=SOLVER_PATH):
+    """בניית הטבלה ושמירתה לקובץ - הלבן עונה בפתרון מלא, והסדר של המנוע שובר שוויון"""
+    entries = {}
+    for size in sizes:
+        start = time.perf_counter()
+        solver = ExactSolver(size, max_nodes=None)
+        engine = GomokuEngine()
+        engine.killers = [[None, None]]
+
+        def reply(state):
+            bb = state.bitboard
+            order = engine.order_moves(bb, list(bb.candidate_cells()), 1, 0, None)
+            result = solver.best_move(bb, 1, order)
+            if result is None:
+                return None
+            return result[1], bb.cell(result[0])
+
+        positions = table_positions(size, reply)
+        for state, value, move in positions:
+            key, t = canonical_hash(state.bitboard)
+            r, c = symmetries(size)[t](*move)
+            entries[(size, key)] = (value, r * size + c)
+        values = [value for _, value, _ in positions]
+        print(f"{size}x{size}: {len(positions)} positions (win {values.count(WIN)}, draw {values.count(DRAW)}, "
+              f"loss {values.count(LOSS)}) in {time.perf_counter() - start:.1f}s")
+    save_table(entries, path)
+    print(f"Saved {len(entries)} positions to {path}")
+
+
+def validate(size=SOLVER_MAX_SIZE, depth=2):
+    """השוואת החיפוש ההיוריסטי לתוצאות המדויקות על עמדות הטבלה
+
+    לכל עמדה נבדק הערך המדויק של המהלך שהחיפוש לעומק depth בוחר, מול
+    הערך השמור בטבלה. מחזיר את מספר העמדות ואת העמדות שבהן המהלך גרוע יותר.
+    """
+    table = shared_table()
+    solver = ExactSolver(size, max_nodes=None)
+
+    def reply(state):
+        key, t = canonical_hash(state.bitboard)
+        entry = table.get((size, key))
+        if entry is None:
+            return None
+        return entry[0], symmetries(size)[INVERSE[t]](*divmod(entry[1], size))
+
+    checked = 0
+    mistakes = []
+    for state, optimal, best in table_positions(size, reply):
+        move = GomokuEngine().search_fixed_depth(state, depth)
+        checked += 1
+        if move == best:
+            continue
+        bb = state.bitboard
+        value = -solver.solve(bb.stones[0], bb.stones[1] | 1 << bb.index(*move), bb.blocks)
+        if value < optimal:
+            mistakes.append((state.board, move, value, optimal))
+    return checked, mistakes
+
+
+def main():
+    """בניית טבלת הפותר או בדיקת החיפוש ההיוריסטי מולה"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--build', action='store_true')
+    parser.add_argument('--validate', action='store_true')
+    parser.add_argument('--depth', type=int, default=2)
+    args = parser.parse_args()
+    if args.build:
+        build()
+    if args.validate:
+        checked, mistakes = validate(depth=args.depth)
+        print(f"depth {args.depth}: {len(mistakes)} of {checked} table positions lose value")
+        for board, move, value, optimal in mistakes:
+            print(move, value, optimal)
+
+
+if __name__ == "__main__":
+    main()
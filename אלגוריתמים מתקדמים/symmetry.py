@@ -0,0 +1,108 @@
+"""סימטריות הלוח - מיפוי כל עמדה לצורה קנונית תחת 8 הסיבובים והשיקופים
+
+לוח ריבועי שקול לעצמו תחת 4 סיבובים ו-4 שיקופים. המפתח הקנוני של עמדה
+הוא המינימום של מפתח ה-Zobrist על פני שמונת העותקים, כך שעמדות שקולות
+מקבלות אותו מפתח - בטבלת הטרנספוזיציה ובספר הפתיחות. הסימטריה שנתנה את
+המינימום מאפשרת להעביר מהלכים בין הלוח האמיתי למערכת הצירים הקנונית.
+
+המודול לא מייבא את המנוע - הוא עובד על כל אובייקט עם השדות של BitBoard
+(board_size, stride, zobrist, stones, blocks).
+"""
+from operator import xor
+
+# הסימטריה ההפוכה לכל אחת מהשמונה - רק הסיבובים ב-90 ו-270 מתחלפים
+INVERSE = [0, 3, 2, 1, 4, 5, 6, 7]
+
+_tables_cache = {}
+
+
+def symmetries(size):
+    """8 הסימטריות של לוח ריבועי - פונקציות (row, col) -> (row, col)"""
+    n = size - 1
+    return [
+        lambda r, c: (r, c),
+        lambda r, c: (c, n - r),
+        lambda r, c: (n - r, n - c),
+        lambda r, c: (n - c, r),
+        lambda r, c: (r, n - c),
+        lambda r, c: (n - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (n - c, n - r),
+    ]
+
+
+def _tables(bb):
+    """טבלאות לגודל לוח - מיפוי ביטים לכל סימטריה ומפתחות Zobrist ממופים
+
+    maps[t][idx] הוא הביט שאליו התא idx עובר בסימטריה t (או -1 בעמודת
+    הריפוד). keys[code][idx] הוא שמיניית מפתחות ה-Zobrist של התא אחרי כל
+    אחת מהסימטריות, כדי שמפתח קנוני יחושב ב-XOR אחד לכל חתיכה.
+    """
+    size = bb.board_size
+    if size not in _tables_cache:
+        stride = bb.stride
+        cells = stride * size
+        maps = []
+        for transform in symmetries(size):
+            mapping = [-1] * cells
+            for r in range(size):
+                for c in range(size):
+                    rr, cc = transform(r, c)
+                    mapping[r * stride + c] = rr * stride + cc
+            maps.append(mapping)
+        keys = [None] + [[tuple(bb.zobrist[maps[t][idx]][code] if maps[t][idx] >= 0 else 0 for t in range(8))
+                          for idx in range(cells)] for code in (1, 2, 3)]
+        _tables_cache[size] = (maps, keys)
+    return _tables_cache[size]
+
+
+def symmetric_keys(bb):
+    """מפתחות ה-Zobrist של שמונת העותקים הסימטריים של העמדה"""
+    keys = [0] * 8
+    cell_keys = _tables(bb)[1]
+    for code, mask in ((1, bb.stones[0]), (2, bb.stones[1]), (3, bb.blocks)):
+        table = cell_keys[code]
+        while mask:
+            low = mask & -mask
+            keys = list(map(xor, keys, table[low.bit_length() - 1]))
+            mask ^= low
+    return keys
+
+
+def canonical_hash(bb):
+    """המפתח הקנוני של עמדה - (המפתח המינימלי, מספר הסימטריה שנתנה אותו)"""
+    keys = symmetric_keys(bb)
+    key = min(keys)
+    return key, keys.index(key)
+
+
+def cell_maps(bb):
+    """מיפוי הביטים של כל סימטריה - maps[t][idx] הוא הביט שאליו idx עובר"""
+    return _tables(bb)[0]
+
+
+def map_cell(bb, idx, t):
+    """העברת ביט של תא דרך סימטריה t"""
+    return _tables(bb)[0][t][idx]
+
+
+def unique_moves(bb, moves):
+    """סינון מהלכים שקולים - בעמדה סימטרית נשאר מהלך אחד מכל קבוצת מהלכים שקולים
+
+    הסימטריות שמשאירות את העמדה במקומה (אלה שהמפתח שלהן שווה למפתח
+    הזהות) ממפות מהלך למהלך שקול לחלוטין. הסדר של moves נשמר.
+    """
+    keys = symmetric_keys(bb)
+    fixing = [t for t in range(1, 8) if keys[t] == keys[0]]
+    if not fixing:
+        return moves
+    maps = _tables(bb)[0]
+    seen = set()
+    unique = []
+    for idx in moves:
+        if idx in seen:
+            continue
+        unique.append(idx)
+        seen.add(idx)
+        seen.update(maps[t][idx] for t in fixing)
+    return unique
@@ -0,0 +1,93 @@
+"""בדיקות המנוע - החיפוש בשורש על לוח עבודה יחיד מול הגרסה שהעתיקה לוח לכל מועמד
+
+    python -m pytest test_engine.py
+"""
+import pytest
+
+from engine import GameState, GomokuEngine, PLAYER_SYMBOLS, BLOCK_SYMBOL, AI_MAX_DEPTH
+
+# סימני השורות בעמדות הקבועות
+ROW_SYMBOLS = {'.': None, 'X': PLAYER_SYMBOLS[0], 'O': PLAYER_SYMBOLS[1], '#': BLOCK_SYMBOL}
+
+# עמדות עם חסימות שבהן ה-AI מנצח מיד או חוסם ארבע, והמהלך שה-AI המקורי
+# (find_best_move של GomokuGUI ב-fc31075, לפני המנוע הנפרד) בחר בהן
+IMMEDIATE_POSITIONS = [
+    (['..XO.', 'OOO.O', '.X..#', '.XX..', 'X....'], (1, 3)),
+    (['.O#.#', 'OO...', 'O...X', 'XXX.X', '#..O.'], (3, 3)),
+    (['O.O..', 'O..XO', '#.X.#', '.XO.#', 'X...X'], (0, 4)),
+    (['O.#X.', '##..X', '.X..X', 'OO.OO', '...X.'], (3, 2)),
+    (['..XX....', '.O.OOO..', 'X.X.O...', '......OX', '.....X..', '.X.....#', '.O......', '........'], (1, 2)),
+    (['O..O....', '..O.....', '.....O.O', '........', '....XOO.', '...XX#OX', '..X.....', '.XX....X'], (3, 5)),
+    (['..O....X', '..O.....', '..O..XO.', '.......X', '.OO....X', '.X......', '.....X#.', '........'], (3, 2)),
+    (['..X.O...', '.....#..', '.....XO.', '.X......', 'O....X#.', 'O....X.O', '...X.XO.', 'OX......'], (3, 5)),
+    (['.X.....O..', '......O...', '.O..O.....', '...OO....X', '....X.....',
+      '...XXX....', '.#....X.#.', '.O........', '........X.', '......#...'], (7, 7)),
+    (['........XX', '.O......O.', '..O.......', 'XX........', '..........',
+      '.X........', '.....X..O.', 'O..O......', '.X..X.XX..', 'OO.OO..#..'], (9, 2)),
+    (['.O........', '..........', '..........', '..O..O....', '.O.......X',
+      'X.#.......', '..........', 'XX.XX.....', '...O....X.', '........O.'], (7, 2)),
+    (['..#.....X.', '..X#..O...', '.X......X.', 'OX........', '....#....O',
+      'O.........', 'O.........', 'O......X..', '..........', '.X........'], (4, 0)),
+]
+
+# עמדות עם חסימות בלי ניצחון או חסימה מיידיים - ההחלטה מגיעה מהחיפוש בשורש
+QUIET_POSITIONS = [
+    ['.....', '.#OX#', '.....', '#.XO.', 'OO.XX'],
+    ['O#.#.', '...OX', 'O..X#', '..X..', '....X'],
+    ['O..#..X.', '....X..O', '........', '.O.#.#X.', '........', 'X.......', 'O..O....', '....X..X'],
+    ['...OX...', 'O.......', '.X..O...', '........', '.X.O.X..', '....X.#.', '....X..O', '........'],
+    ['X.........', '.X........', '..........', '...#......', '....X.....',
+     '..O....O..', '......X...', '..........', '..#.OO.X..', 'X.OO......'],
+    ['X..X...O..', '..........', '.OO.#.X..O', 'X..O..O...', '..........',
+     '.......XX.', '....O.....', '..........', '.X........', '...O...X..'],
+]
+
+
+def make_state(rows):
+    """בניית מצב משחק משורות של תווים"""
+    state = GameState(len(rows))
+    for row, line in enumerate(rows):
+        for col, char in enumerate(line):
+            if ROW_SYMBOLS[char] is not None:
+                state.place(row, col, ROW_SYMBOLS[char])
+    return state
+
+
+def fresh_engine():
+    """מנוע חדש עם מערך killers מוכן, כמו בתחילת חיפוש"""
+    engine = GomokuEngine()
+    engine.killers = [[None, None] for _ in range(AI_MAX_DEPTH + 1)]
+    return engine
+
+
+def copying_search(state, moves, depth):
+    """החיפוש בשורש כמו לפני לוח העבודה היחיד - עותק של המצב ומנוע חדש לכל מועמד"""
+    best_move = None
+    best_score = float('-inf')
+    for idx in moves:
+        row, col = state.bitboard.cell(idx)
+        child = state.with_move(row, col, PLAYER_SYMBOLS[1])
+        score = fresh_engine().minimax(child.bitboard, depth - 1, False, float('-inf'), float('inf'), idx, 1)
+        if score > best_score:
+            best_score = score
+            best_move = idx
+    return best_move
+
+
+@pytest.mark.parametrize('rows, expected', IMMEDIATE_POSITIONS)
+def test_immediate_move_matches_pre_series_engine(rows, expected):
+    """ניצחון או חסימה מיידיים - אותו תא שהמנוע המקורי בחר"""
+    assert GomokuEngine().find_best_move(make_state(rows)) == expected
+
+
+@pytest.mark.parametrize('rows', QUIET_POSITIONS)
+@pytest.mark.parametrize('depth', [2, 3])
+def test_in_place_root_matches_copying_search(rows, depth):
+    """החיפוש על לוח עבודה יחיד בוחר את המהלך של החיפוש המעתיק ומחזיר את הלוח כמו שהיה"""
+    state = make_state(rows)
+    bb = state.bitboard.copy()
+    moves = list(bb.candidate_cells())
+    before = (bb.hash, bb.score, list(bb.line_codes), list(bb.stones), bb.blocks)
+    move, _ = fresh_engine().search_root(bb, moves, depth)
+    assert move == copying_search(state, moves, depth)
+    assert (bb.hash, bb.score, list(bb.line_codes), list(bb.stones), bb.blocks) == before
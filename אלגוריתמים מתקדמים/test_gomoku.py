@@ -0,0 +1,128 @@
+"""בדיקות הממשק בלי תצוגה - canvas מדומה במקום Tkinter, ותמונות PIL במקום PhotoImage
+
+    python -m pytest test_gomoku.py
+"""
+import gc
+import tracemalloc
+
+import pytest
+
+import gomoku
+from engine import GameState, PLAYER_SYMBOLS, BLOCK_SYMBOL
+
+SOAK_REDRAWS = 2000  # מספר שינויי הגודל בבדיקת העומס
+SOAK_WARMUP = 500  # אחרי כמה שינויים נמדד הבסיס של הזיכרון
+SOAK_MAX_GROWTH = 256 * 1024  # גידול הזיכרון המרבי שמותר בין הבסיס לסוף, בבתים
+SPRITE_KINDS = 4  # רקע, תא, חייל שחור וחייל לבן
+
+
+class FakeCanvas:
+    """canvas מדומה - שומר את התגיות של כל פריט ואת המידות שנקבעו לו"""
+
+    def __init__(self, width=800, height=700):
+        """canvas ריק במידות נתונות"""
+        self.width = width
+        self.height = height
+        self.items = {}
+        self.next_id = 0
+
+    def winfo_width(self):
+        """רוחב ה-canvas"""
+        return self.width
+
+    def winfo_height(self):
+        """גובה ה-canvas"""
+        return self.height
+
+    def _create(self, tags):
+        """רישום פריט חדש עם התגיות שלו"""
+        self.next_id += 1
+        self.items[self.next_id] = {tags} if isinstance(tags, str) else set(tags)
+        return self.next_id
+
+    def create_image(self, *args, image=None, anchor=None, tags=()):
+        """פריט תמונה"""
+        return self._create(tags)
+
+    def create_text(self, *args, tags=(), **kwargs):
+        """פריט טקסט"""
+        return self._create(tags)
+
+    def delete(self, tag):
+        """מחיקת כל הפריטים עם התגית (או כולם ב-'all')"""
+        for item in [item for item, tags in self.items.items() if tag == 'all' or tag in tags]:
+            del self.items[item]
+
+    def move(self, tag, dx, dy):
+        """הזזה - לא משנה את מספר הפריטים"""
+
+
+class FakeRoot:
+    """root מדומה - after לא מתזמן דבר, כי הבדיקה קוראת ל-apply_resize ישירות"""
+
+    def after(self, ms, func, *args):
+        """תזמון שלא מתבצע"""
+        return None
+
+    def after_cancel(self, job):
+        """ביטול תזמון"""
+
+
+@pytest.fixture
+def gui(monkeypatch):
+    """ממשק על לוח 10x10 עם חיילים וחסימה, בלי חלון אמיתי"""
+    monkeypatch.setattr(gomoku.ImageTk, 'PhotoImage', lambda image: image)
+    app = gomoku.GomokuGUI.__new__(gomoku.GomokuGUI)
+    app.root = FakeRoot()
+    app.board_canvas = FakeCanvas()
+    app._sprite_cache = {}
+    app._resize_job = None
+    app._resize_started = 0.0
+    app.board_size = 10
+    app.state = GameState(10)
+    for i in range(4):
+        app.state.place(i, i, PLAYER_SYMBOLS[0])
+        app.state.place(i, i + 1, PLAYER_SYMBOLS[1])
+    app.state.place(9, 0, BLOCK_SYMBOL)
+    return app
+
+
+def canvas_sizes(count):
+    """רצף מידות של canvas שחוזר על עצמו - גדלי תא שונים והזזות באותו גודל תא"""
+    return [(600 + (i % 40) * 7, 500 + (i % 33) * 5) for i in range(count)]
+
+
+def test_resize_soak_keeps_sprite_cache_and_memory_flat(gui):
+    """אלפי שינויי גודל - המטמון נשאר בגודל של מידה אחת והזיכרון לא גדל"""
+    gui.draw_modern_board()
+    tracemalloc.start()
+    try:
+        baseline = None
+        for i, (width, height) in enumerate(canvas_sizes(SOAK_REDRAWS)):
+            gui.board_canvas.width = width
+            gui.board_canvas.height = height
+            if i % 2:
+                gui.apply_resize()
+            else:
+                gui.draw_modern_board()
+            assert len(gui._sprite_cache) <= SPRITE_KINDS
+            if i + 1 == SOAK_WARMUP:
+                gc.collect()
+                baseline = tracemalloc.get_traced_memory()[0]
+        gc.collect()
+        final = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert final - baseline < SOAK_MAX_GROWTH
+    # ציור מחדש מוחק את הפריטים הישנים - תאים וחיילים של הלוח הנוכחי בלבד
+    assert len(gui.board_canvas.items) == 1 + 10 * 10 + 9
+
+
+def test_prune_sprite_cache_keeps_only_current_size(gui):
+    """prune_sprite_cache משחרר את כל התמונות של גדלים אחרים"""
+    gui.get_cell_sprite(40, 'cell')
+    gui.get_cell_sprite(50, 'black')
+    gui.get_board_sprite(464, 464)
+    gui.get_board_sprite(564, 564)
+    gui.prune_sprite_cache(50, (564, 564))
+    assert set(gui._sprite_cache) == {(50, 'black'), ((564, 564), 'board')}
@@ -0,0 +1,118 @@
+"""הערכה וקטורית של מהלכי השורש - כל המועמדים בבת אחת עם NumPy
+
+הלוח נבנה כמערך int8 של קודי תאים (EMPTY_CODE, BLACK_CODE, WHITE_CODE,
+BLOCK_CODE) עם מסגרת של חסימות, כמו הריפוד של score_line. לכל אחד מארבעת
+הכיוונים קודי כל חלונות התבנית מחושבים בהזזות של המערך, והציון שלהם נלקח
+מ-PATTERN_SCORES באינדוקס אחד. השינוי בציון כשחתיכה מונחת בתא הוא סכום
+השינויים בכל החלונות שעוברים דרכו - 6 מיקומים בחלון לכל כיוון, כלומר 24
+פעולות מערך לכל המועמדים יחד במקום הנחה והסרה לכל מועמד.
+
+NumPy אופציונלי - בלעדיו HAVE_NUMPY הוא False והמנוע מסדר את השורש בלעדיו.
+
+השוואת הזמן מול הנחה והסרה לכל מועמד על הלוח הרגיל:
+    python vector_eval.py --size 15 --stones 30
+"""
+import argparse
+import random
+import time
+
+from engine import BitBoard, DIRECTIONS, PATTERN_LENGTH, PATTERN_MASK, PATTERN_SCORES, BLACK_CODE, WHITE_CODE, BLOCK_CODE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+_pattern_table = None
+
+
+def board_codes(bb):
+    """מערך קודי התאים של הלוח, עם מסגרת חסימות ברוחב תא אחד"""
+    size = bb.board_size
+    cells = size * bb.stride
+    codes = np.full((size + 2, size + 2), BLOCK_CODE, dtype=np.int8)
+    inner = np.zeros(cells, dtype=np.int8)
+    for mask, code in ((bb.stones[0], BLACK_CODE), (bb.stones[1], WHITE_CODE), (bb.blocks, BLOCK_CODE)):
+        bits = np.unpackbits(np.frombuffer(mask.to_bytes((cells + 7) // 8, 'little'), dtype=np.uint8),
+                             bitorder='little')[:cells]
+        inner[bits.astype(bool)] = code
+    codes[1:-1, 1:-1] = inner.reshape(size, bb.stride)[:, :size]
+    return codes
+
+
+def _window_views(codes, d_row, d_col):
+    """לכל מיקום k בחלון - (שורות, עמודות) של התא ה-k בכל החלונות בכיוון נתון"""
+    span = PATTERN_LENGTH - 1
+    rows = codes.shape[0] - span * d_row
+    cols = codes.shape[1] - span * abs(d_col)
+    col_start = span if d_col < 0 else 0
+    return [(slice(k * d_row, k * d_row + rows), slice(col_start + k * d_col, col_start + k * d_col + cols))
+            for k in range(PATTERN_LENGTH)]
+
+
+def score_moves(bb, moves, side):
+    """ציון ההערכה אחרי כל מהלך ברשימה - כמו bb.score אחרי place(idx, side), לכל המהלכים יחד
+
+    הציונים מנקודת המבט של הלבן, כמו evaluate_board.
+    """
+    global _pattern_table
+    if _pattern_table is None:
+        _pattern_table = np.array(PATTERN_SCORES, dtype=np.int64)
+    table = _pattern_table
+    codes = board_codes(bb)
+    wide = codes.astype(np.int32)
+    own = WHITE_CODE if side == 1 else BLACK_CODE
+    total = 0
+    delta = np.zeros(codes.shape, dtype=np.int64)
+    for d_row, d_col in DIRECTIONS:
+        views = _window_views(codes, d_row, d_col)
+        windows = np.zeros(wide[views[0]].shape, dtype=np.int32)
+        for k, view in enumerate(views):
+            windows |= wide[view] << 2 * k
+        before = table[windows]
+        total += int(before.sum())
+        for k, view in enumerate(views):
+            # בתא תפוס החיבור גולש לתא הבא - הערך חסר משמעות, ומהלכים הם תמיד תאים ריקים
+            delta[view] += table[(windows + (own << 2 * k)) & PATTERN_MASK] - before
+    stride = bb.stride
+    return [total + int(delta[idx // stride + 1, idx % stride + 1]) for idx in moves]
+
+
+def main():
+    """השוואת הזמן של ציון כל המועמדים - וקטורי מול הנחה והסרה על לוח הביטים"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--size', type=int, default=15)
+    parser.add_argument('--stones', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    if not HAVE_NUMPY:
+        print("NumPy is not installed")
+        return
+    rng = random.Random(args.seed)
+    bb = BitBoard(args.size)
+    cells = rng.sample(range(args.size * args.size), args.stones)
+    for i, cell in enumerate(cells):
+        bb.place(bb.index(*divmod(cell, args.size)), i % 2)
+    moves = list(bb.candidate_cells())
+
+    def scalar():
+        scores = []
+        for idx in moves:
+            bb.place(idx, 1)
+            scores.append(bb.score)
+            bb.remove(idx, 1)
+        return scores
+
+    assert scalar() == score_moves(bb, moves, 1)
+    for name, func in (('scalar', scalar), ('numpy', lambda: score_moves(bb, moves, 1))):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            func()
+        print(f"{name}: {(time.perf_counter() - start) / args.repeat * 1e6:.0f} us for {len(moves)} moves")
+
+
+if __name__ == "__main__":
+    main()